@@ -24,6 +24,7 @@ from ui.estimator import render_estimator_tab
 from ui.production import render_production_tab
 from ui.settings_ui import render_settings_tab
 from ui.quote_lookup import render_quote_lookup_tab
+from ui.batch_production import render_batch_production_tab
 
 # -------------------------------------
 # HINGE LOADER
@@ -72,6 +73,9 @@ if "cust" not in st.session_state:
 if "proj" not in st.session_state:
     st.session_state.proj = ""
 
+if "qnum" not in st.session_state:
+    st.session_state.qnum = ""
+
 if "rows" not in st.session_state:
     st.session_state.rows = []
 
@@ -101,6 +105,7 @@ if st.session_state.pending_load is not None:
     data = st.session_state.pending_load
     st.session_state.cust = data["customer"]
     st.session_state.proj = data["project"]
+    st.session_state.qnum = data.get("q_number", "")
     st.session_state.rows = data["raw_rows"]
     st.session_state.pending_load = None
 
@@ -114,6 +119,7 @@ tabs = st.tabs([
     "Estimator + Quote Table",
     "Production",
     "Quote Lookup",
+    "Batch Production",
 ])
 
 
@@ -145,3 +151,10 @@ with tabs[2]:
 with tabs[3]:
     render_quote_lookup_tab()
 
+
+
+# =====================================
+# TAB 5 — BATCH PRODUCTION
+# =====================================
+with tabs[4]:
+    render_batch_production_tab(S)
@@ -0,0 +1,47 @@
+"""
+Cut list engine benchmark: best-fit decreasing vs the old first-fit builder.
+
+    python -m benchmarks.cutlist_bench [--pieces 12000] [--seed 1]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from core.cutlist import best_fit_decreasing, cut_list_frame, first_fit_decreasing
+
+
+def make_pieces(n, seed):
+    """Realistic leg/head mix: 2 legs + 1 head per door."""
+    rng = np.random.default_rng(seed)
+    doors = n // 3
+    legs = rng.integers(1990, 2440, doors)
+    heads = rng.integers(450, 2000, doors)
+    return np.concatenate([legs, legs, heads])
+
+
+def timed(fn, *args):
+    t = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - t
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pieces", type=int, default=12000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    pieces = make_pieces(args.pieces, args.seed)
+
+    for label, stocks in [("Only 5.4", [5400]), ("Mix", [2100, 5400])]:
+        old, t_old = timed(first_fit_decreasing, pieces, stocks)
+        new, t_new = timed(lambda p, s: cut_list_frame(best_fit_decreasing(p, s)), pieces, stocks)
+
+        print(f"{label}: {len(pieces)} pieces")
+        print(f"  first-fit  {t_old * 1000:9.1f} ms  {len(old):6d} lengths  waste {old['Waste (mm)'].sum():9d} mm")
+        print(f"  best-fit   {t_new * 1000:9.1f} ms  {len(new):6d} lengths  waste {new['Waste (mm)'].sum():9d} mm")
+
+
+if __name__ == "__main__":
+    main()
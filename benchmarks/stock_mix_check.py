@@ -0,0 +1,79 @@
+"""
+Property check: core.stock.stock_mix against brute force.
+
+    python -m benchmarks.stock_mix_check [--cases 500] [--seed 1]
+
+Random stock length sets (1-3 lengths, optional prices) and random totals;
+stock_mix must match the brute-force optimum cost (and never under-cover).
+Half the sets are arbitrary mm (small gcd, e.g. 2099 / 3001 / 5400), which
+takes stock_mix down its DP path.
+"""
+import argparse
+import time
+from itertools import product
+
+import numpy as np
+
+from core.stock import stock_mix
+
+# Coprime / small-gcd sets that blow up the exchange enumeration
+FIXED_SETS = [[2099, 3001, 5400], [2101, 5400], [2101, 3001, 5400], [1999, 4999]]
+
+
+def brute_force(total, lengths, price):
+    """Cheapest covering count vector by exhaustive search."""
+    best = None
+    upper = [total // l + 1 for l in lengths]
+    for counts in product(*(range(u + 1) for u in upper)):
+        covered = sum(c * l for c, l in zip(counts, lengths))
+        if covered < total:
+            continue
+        cost = round(sum(c * p for c, p in zip(counts, price)), 9)
+        key = (cost, covered)
+        if best is None or key < best[0]:
+            best = (key, counts)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cases", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    t = time.perf_counter()
+
+    for case in range(args.cases):
+        k = int(rng.integers(1, 4))
+        if case < len(FIXED_SETS):
+            lengths = FIXED_SETS[case]
+        elif rng.random() < 0.5:
+            lengths = sorted(set(int(x) for x in rng.integers(500, 6000, k)))
+        else:
+            lengths = sorted(set(int(x) * 100 for x in rng.integers(5, 60, k)))
+        prices = None
+        if rng.random() < 0.5:
+            prices = {l: round(float(l) / 100 * rng.uniform(0.6, 1.4), 2) for l in lengths}
+        price = [prices[l] if prices else l for l in lengths]
+
+        totals = rng.integers(0, 16000, 8)
+        counts, waste = stock_mix(totals, lengths, prices)
+
+        for total, c, w in zip(totals.tolist(), counts, waste):
+            covered = int(c @ np.asarray(lengths))
+            assert covered >= total, (lengths, total, c)
+            assert w == covered - max(total, 0)
+            if total <= 0:
+                assert not c.any()
+                continue
+            (bf_cost, bf_covered), _ = brute_force(total, lengths, price)
+            cost = round(float(c @ np.asarray(price, dtype=float)), 9)
+            assert abs(cost - bf_cost) < 1e-6, (lengths, prices, total, c, cost, bf_cost)
+            assert covered == bf_covered, (lengths, prices, total, c, covered, bf_covered)
+
+    print(f"{args.cases} cases OK in {time.perf_counter() - t:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
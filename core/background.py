@@ -0,0 +1,111 @@
+"""
+Exports built off the Streamlit script thread, cached by content hash.
+
+A build is submitted once per key; reruns while it runs just read its
+progress, and the finished bytes stay in a small LRU so the same inputs
+never build twice.
+"""
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from core.plan_cache import LRUCache
+
+EXPORT_CACHE_SIZE = 8
+
+
+def content_hash(*parts):
+    """sha1 over DataFrames (by content), dicts of DataFrames and plain values."""
+    h = hashlib.sha1()
+
+    def feed(p):
+        if isinstance(p, pd.DataFrame):
+            h.update(repr(list(p.columns)).encode("utf-8"))
+            try:
+                h.update(pd.util.hash_pandas_object(p, index=False).to_numpy().tobytes())
+            except TypeError:
+                # Unhashable cells (lists, dicts): fall back to text
+                h.update(p.to_csv(index=False).encode("utf-8"))
+        elif isinstance(p, dict):
+            for k in sorted(p, key=str):
+                h.update(str(k).encode("utf-8"))
+                feed(p[k])
+        else:
+            h.update(repr(p).encode("utf-8"))
+        h.update(b"\x00")
+
+    for p in parts:
+        feed(p)
+    return h.hexdigest()
+
+
+class BackgroundBuilds:
+    """
+    One worker thread + an LRU of finished results.
+
+        status(key) -> ("done", result) | ("running", fraction) |
+                       ("failed", error) | ("idle", None)
+    """
+
+    def __init__(self, maxsize=EXPORT_CACHE_SIZE):
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="export")
+        self._results = LRUCache(maxsize)
+        self._running = {}  # key -> (future, progress dict)
+        self._lock = threading.Lock()
+
+    def submit(self, key, fn, *args, **kwargs):
+        """Start fn(*args, progress=callback, **kwargs) unless key is done or running."""
+        with self._lock:
+            if self._results.get(key) is not None or key in self._running:
+                return
+            progress = {"fraction": 0.0}
+
+            def report(fraction):
+                progress["fraction"] = float(fraction)
+
+            future = self._pool.submit(fn, *args, progress=report, **kwargs)
+            self._running[key] = (future, progress)
+
+    def status(self, key):
+        with self._lock:
+            result = self._results.get(key)
+            if result is not None:
+                return "done", result
+
+            if key not in self._running:
+                return "idle", None
+
+            future, progress = self._running[key]
+            if not future.done():
+                return "running", progress["fraction"]
+
+            del self._running[key]
+            error = future.exception()
+            if error is not None:
+                return "failed", error
+
+            result = future.result()
+            self._results.put(key, result)
+            return "done", result
+
+    def wait(self, key, timeout=None):
+        with self._lock:
+            running = self._running.get(key)
+        if running is not None:
+            try:
+                running[0].result(timeout=timeout)
+            except Exception:
+                pass
+        return self.status(key)
+
+
+_BUILDS = {}
+
+
+def get_background_builds(name):
+    """One BackgroundBuilds per export kind for the whole process."""
+    if name not in _BUILDS:
+        _BUILDS[name] = BackgroundBuilds()
+    return _BUILDS[name]
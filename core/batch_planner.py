@@ -0,0 +1,153 @@
+import numpy as np
+import pandas as pd
+
+from core.cutlist import cut_list_frame
+from core.cutting_stock import solve_cutting_stock, DEFAULT_TIME_BUDGET_S
+from core.production_helpers import build_production_calcs, expand_quote_rows
+from core.save_load import load_quote, quote_rows_frame
+
+STOP_PROFILE = "Stops"
+PARTS = ["Leg", "Leg", "Head"]
+
+
+# ============================================================
+# JOB LOADING
+# ============================================================
+
+def load_job(qnum, doors=None):
+    """
+    Saved quote -> (doors, quote lines). doors can be a measured door set;
+    otherwise every door gets the default undercut / FFH.
+    """
+    data = load_quote(qnum)
+    if data is None:
+        raise ValueError(f"Quote {qnum} not found")
+
+    og_df = quote_rows_frame(data)
+    if doors is None:
+        doors = expand_quote_rows(og_df)
+    return doors, og_df
+
+
+# ============================================================
+# PIECE TABLE
+# ============================================================
+
+def batch_pieces(jobs):
+    """
+    jobs: {job: (doors, og_df)} -> one row per leg/head piece:
+        ['Job', 'Door #', 'Profile', 'Part', 'Length (mm)']
+    """
+    frames = []
+    for job, (doors, og_df) in jobs.items():
+        calc = build_production_calcs(doors, og_df)
+        if calc.empty:
+            continue
+
+        n = len(calc)
+        profile = calc["JambType"].astype(str).str.split().str[0].to_numpy()
+        frames.append(pd.DataFrame({
+            "Job": np.full(3 * n, job, dtype=object),
+            "Door #": np.tile(calc["Door #"].to_numpy(), 3),
+            "Profile": np.tile(profile, 3),
+            "Part": np.repeat(PARTS, n),
+            "Length (mm)": np.concatenate([
+                calc["Leg (mm)"].to_numpy(),
+                calc["Leg (mm)"].to_numpy(),
+                calc["Head (mm)"].to_numpy(),
+            ]).astype(np.int64),
+        }))
+
+    if not frames:
+        return pd.DataFrame(columns=["Job", "Door #", "Profile", "Part", "Length (mm)"])
+    return pd.concat(frames, ignore_index=True)
+
+
+# ============================================================
+# ALLOCATION
+# ============================================================
+
+def _allocate(lengths, plan):
+    """
+    Equal lengths are interchangeable, so line up pieces and plan cuts
+    longest-first and hand each piece the stock length its twin landed in.
+    """
+    mine = np.argsort(-lengths, kind="stable")
+    theirs = np.argsort(-plan["piece"], kind="stable")
+    bundle = np.empty(len(lengths), dtype=np.int64)
+    bundle[mine] = plan["bundle"][theirs]
+    return bundle
+
+
+def _solve_group(pieces, stock_lengths, kerf, prices, time_budget):
+    plan = solve_cutting_stock(
+        pieces["Length (mm)"].to_numpy(), stock_lengths,
+        kerf=kerf, prices=prices, time_budget=time_budget
+    )
+    bundle = _allocate(pieces["Length (mm)"].to_numpy(), plan)
+    return plan, bundle
+
+
+# ============================================================
+# BATCH PLAN
+# ============================================================
+
+def plan_batch(jobs, jamb_stock_lengths, stop_stock_lengths, kerf=0, prices=None,
+               time_budget=DEFAULT_TIME_BUDGET_S, compare=True):
+    """
+    Pool every job's legs/heads per jamb profile (and all of them for
+    stops) and cut them as one run. time_budget is per profile (the
+    per-job comparison shares one profile's budget between the jobs).
+
+    Returns dict:
+        cutlists    {title: cut list table} for the combined run
+        allocation  one row per piece: job, door, part, which stock length
+        purchases   stock lengths to buy per profile, combined vs
+                    (if compare) planned job by job
+    """
+    pieces = batch_pieces(jobs)
+    groups = [(p, g) for p, g in pieces.groupby("Profile", sort=True)] if not pieces.empty else []
+
+    cutlists = {}
+    alloc = []
+    purchases = []
+
+    def run(title, grp, stock_lengths):
+        plan, bundle = _solve_group(grp, stock_lengths, kerf, prices, time_budget)
+        cutlists[title] = cut_list_frame(plan)
+
+        alloc.append(grp.assign(**{
+            "Cut List": title,
+            "Stock #": bundle + 1,
+            "Stock Length (mm)": plan["stock"][bundle],
+        }))
+
+        per_job = np.zeros(len(stock_lengths), dtype=np.int64)
+        if compare:
+            for _, job_grp in grp.groupby("Job", sort=False):
+                job_plan = solve_cutting_stock(
+                    job_grp["Length (mm)"].to_numpy(), stock_lengths,
+                    kerf=kerf, prices=prices, time_budget=time_budget / max(len(jobs), 1)
+                )
+                per_job += [(job_plan["stock"] == s).sum() for s in stock_lengths]
+
+        for i, s in enumerate(stock_lengths):
+            combined = int((plan["stock"] == s).sum())
+            row = {"Cut List": title, "Stock Length (mm)": s, "Combined": combined}
+            if compare:
+                row["Per Job"] = int(per_job[i])
+                row["Saved"] = int(per_job[i]) - combined
+            purchases.append(row)
+
+    for prof, grp in groups:
+        run(f"Jamb — {prof}", grp, jamb_stock_lengths)
+
+    if not pieces.empty:
+        run(STOP_PROFILE, pieces, stop_stock_lengths)
+
+    allocation = pd.concat(alloc, ignore_index=True) if alloc else pieces
+    return {
+        "cutlists": cutlists,
+        "allocation": allocation,
+        "purchases": pd.DataFrame(purchases),
+    }
@@ -0,0 +1,183 @@
+from bisect import bisect_left, insort
+import numpy as np
+import pandas as pd
+
+CUT_LIST_COLUMNS = ["Stock Length (mm)", "Cuts (mm)", "Used (mm)", "Waste (mm)"]
+
+# 1-based, the numbering the saw sequence and batch allocation use
+STOCK_NO = "Stock #"
+
+
+# ============================================================
+# BEST-FIT DECREASING
+# ============================================================
+
+def best_fit_decreasing(piece_lengths, stock_lengths, kerf=0):
+    """
+    Pack pieces (mm) into stock lengths (mm), longest piece first, each
+    into the open bundle with the LEAST room that still fits it.
+    Every cut also consumes kerf mm of saw blade.
+
+    Open bundles are kept in a sorted (remaining, bundle) list, so
+    finding the best fit is a bisect instead of a scan of every bundle.
+    A new bundle uses the shortest stock that fits the piece (or the
+    longest stock if nothing fits, same as the old first-fit builder).
+
+    Returns a columnar plan:
+        piece    piece lengths in cut order
+        bundle   bundle id for each piece
+        stock    stock length per bundle
+        used     mm used per bundle
+    """
+    pieces = np.sort(np.asarray(piece_lengths, dtype=np.int64))[::-1]
+    stocks = sorted(int(s) for s in stock_lengths)
+
+    bundle_of = np.empty(len(pieces), dtype=np.int64)
+    bundle_stock = []
+    bundle_used = []
+
+    open_bins = []  # sorted [(remaining, bundle id)]
+    min_piece = int(pieces[-1]) if len(pieces) else 0
+
+    # Capacity is stock + kerf so the last cut in a length needs no kerf
+    for i, p in enumerate(pieces.tolist()):
+        need = p + kerf
+        j = bisect_left(open_bins, (need, -1))
+
+        if j < len(open_bins):
+            rem, b = open_bins.pop(j)
+            rem -= need
+            bundle_used[b] += p
+        else:
+            b = len(bundle_stock)
+            chosen = next((s for s in stocks if p <= s), stocks[-1])
+            bundle_stock.append(chosen)
+            bundle_used.append(p)
+            rem = chosen + kerf - need
+
+        bundle_of[i] = b
+
+        # Pieces only get shorter, so offcuts below the shortest piece are dead
+        if rem >= min_piece + kerf:
+            insort(open_bins, (rem, b))
+
+    return {
+        "piece": pieces,
+        "bundle": bundle_of,
+        "stock": np.asarray(bundle_stock, dtype=np.int64),
+        "used": np.asarray(bundle_used, dtype=np.int64),
+    }
+
+
+def cut_list_frame(plan):
+    """Columnar plan -> cut list table (one row per stock length, numbered from 1)."""
+    stock = plan["stock"]
+    if len(stock) == 0:
+        return pd.DataFrame(columns=[STOCK_NO] + CUT_LIST_COLUMNS)
+
+    # Stable sort keeps each bundle's cuts in placement (longest first) order
+    order = np.argsort(plan["bundle"], kind="stable")
+    cuts = plan["piece"][order].astype(str)
+    bounds = np.cumsum(np.bincount(plan["bundle"], minlength=len(stock)))[:-1]
+
+    df = pd.DataFrame({
+        "Stock Length (mm)": stock,
+        "Cuts (mm)": [" + ".join(c) for c in np.split(cuts, bounds)],
+        "Used (mm)": plan["used"],
+        "Waste (mm)": stock - plan["used"],
+    }, columns=CUT_LIST_COLUMNS)
+
+    # Plans cut partly from the offcut rack say where each length comes from
+    if "offcut" in plan:
+        df.insert(0, "Source", np.where(
+            plan["offcut"] >= 0,
+            np.char.add("Offcut #", plan["offcut"].astype(str)),
+            "New",
+        ))
+    df.insert(0, STOCK_NO, np.arange(1, len(stock) + 1))
+    return df
+
+
+def stock_ranges(numbers):
+    """[1, 2, 3, 7] -> '1-3, 7'."""
+    nums = sorted(int(n) for n in numbers)
+    runs = []
+    for n in nums:
+        if runs and n == runs[-1][1] + 1:
+            runs[-1][1] = n
+        else:
+            runs.append([n, n])
+    return ", ".join(str(a) if a == b else f"{a}-{b}" for a, b in runs)
+
+
+def group_cut_list(cut_list):
+    """
+    Collapse identical lengths (same stock, same cuts) into one row with
+    a Qty, in order of first appearance. Offcut rows stay one per offcut.
+    Stock # becomes the ranges each row covers, e.g. '1-3, 7'.
+    """
+    if cut_list.empty:
+        return cut_list.assign(Qty=pd.Series(dtype=np.int64))[["Qty"] + list(cut_list.columns)]
+
+    keys = [c for c in cut_list.columns if c not in (STOCK_NO, "Used (mm)", "Waste (mm)")]
+    agg = {
+        "Qty": ("Used (mm)", "size"),
+        "Used (mm)": ("Used (mm)", "first"),
+        "Waste (mm)": ("Waste (mm)", "first"),
+    }
+    if STOCK_NO in cut_list.columns:
+        agg[STOCK_NO] = (STOCK_NO, stock_ranges)
+
+    grouped = cut_list.groupby(keys, sort=False).agg(**agg).reset_index()
+    return grouped[["Qty"] + list(cut_list.columns)]
+
+
+def build_cut_list(piece_lengths, stock_lengths):
+    return cut_list_frame(best_fit_decreasing(piece_lengths, stock_lengths))
+
+
+def frame_pieces(calc_df):
+    """Two legs + one head per door, as one int array (mm)."""
+    legs = calc_df["Leg (mm)"].to_numpy(dtype=np.int64)
+    heads = calc_df["Head (mm)"].to_numpy(dtype=np.int64)
+    return np.concatenate([legs, legs, heads])
+
+
+# ============================================================
+# FIRST-FIT DECREASING (previous builder, kept as a reference)
+# ============================================================
+
+def first_fit_decreasing(piece_lengths, stock_lengths):
+    pieces = sorted([int(x) for x in piece_lengths], reverse=True)
+    stocks = sorted(stock_lengths)
+
+    bundles = []
+
+    for p in pieces:
+        placed = False
+
+        for b in bundles:
+            if p <= (b["stock"] - b["used"]):
+                b["cuts"].append(p)
+                b["used"] += p
+                placed = True
+                break
+
+        if not placed:
+            chosen = next((s for s in stocks if p <= s), max(stocks))
+            bundles.append({
+                "stock": chosen,
+                "cuts": [p],
+                "used": p
+            })
+
+    rows = []
+    for b in bundles:
+        rows.append({
+            "Stock Length (mm)": b["stock"],
+            "Cuts (mm)": " + ".join(str(c) for c in b["cuts"]),
+            "Used (mm)": b["used"],
+            "Waste (mm)": b["stock"] - b["used"]
+        })
+
+    return pd.DataFrame(rows, columns=CUT_LIST_COLUMNS)
@@ -0,0 +1,259 @@
+import time
+import numpy as np
+
+from core.cutlist import best_fit_decreasing
+
+DEFAULT_TIME_BUDGET_S = 0.25
+MAX_SIMPLEX_ITERATIONS = 500
+
+# Above this many distinct lengths the LP is too big to help within budget
+MAX_PATTERN_LENGTHS = 150
+
+
+# ============================================================
+# PLAN HELPERS
+# ============================================================
+
+def plan_cost(plan, prices=None):
+    """Cost of a plan: sum of stock prices (default: stock mm, i.e. waste)."""
+    stock = plan["stock"]
+    if not prices:
+        return float(stock.sum())
+    return float(sum(prices.get(int(s), s) for s in stock.tolist()))
+
+
+def _plan_from_bundles(bundles):
+    """[(stock, [pieces...]), ...] -> columnar plan (same shape as best_fit_decreasing)."""
+    pieces, owner, stock, used = [], [], [], []
+    for b, (s, cuts) in enumerate(bundles):
+        cuts = sorted(cuts, reverse=True)
+        pieces.extend(cuts)
+        owner.extend([b] * len(cuts))
+        stock.append(s)
+        used.append(sum(cuts))
+    return {
+        "piece": np.asarray(pieces, dtype=np.int64),
+        "bundle": np.asarray(owner, dtype=np.int64),
+        "stock": np.asarray(stock, dtype=np.int64),
+        "used": np.asarray(used, dtype=np.int64),
+    }
+
+
+def _bundles_from_plan(plan):
+    bundles = [(int(s), []) for s in plan["stock"].tolist()]
+    for p, b in zip(plan["piece"].tolist(), plan["bundle"].tolist()):
+        bundles[b][1].append(p)
+    return bundles
+
+
+# ============================================================
+# PATTERN GENERATION (bounded knapsack on integer mm)
+# ============================================================
+
+def _best_pattern(lengths, values, demand, capacity, kerf):
+    """
+    Most valuable way to cut one stock length from the open demand.
+
+    Bounded knapsack via binary splitting; each copy is one vectorized
+    pass over the capacity array. Returns (value, counts per length).
+    """
+    cap = capacity + kerf
+    dp = np.zeros(cap + 1)
+    takes = []  # (item, count, weight, taken-at-capacity mask)
+
+    for i in range(len(lengths)):
+        w1 = int(lengths[i]) + kerf
+        if demand[i] <= 0 or w1 > cap:
+            continue
+        bound = min(int(demand[i]), cap // w1)
+        k = 1
+        while bound > 0:
+            n = min(k, bound)
+            w = n * w1
+            # Tiny length bonus breaks value ties towards fuller lengths
+            cand = dp[:-w] + n * (values[i] + 1e-9 * lengths[i])
+            better = cand > dp[w:]
+            dp[w:] = np.where(better, cand, dp[w:])
+            takes.append((i, n, w, better))
+            bound -= n
+            k *= 2
+
+    counts = np.zeros(len(lengths), dtype=np.int64)
+    c = cap
+    for i, n, w, better in reversed(takes):
+        if c >= w and better[c - w]:
+            counts[i] += n
+            c -= w
+
+    return float(dp[cap]), counts
+
+
+def _pattern_plan(lengths, values, demand, stocks, kerf, prices, deadline):
+    """
+    Sequential pattern heuristic: pick the stock length + pattern with the
+    best value per dollar, repeat it as often as demand allows, until done
+    or out of time. Returns (bundles, leftover demand).
+    """
+    demand = demand.copy()
+    bundles = []
+
+    while demand.sum() > 0 and time.perf_counter() < deadline:
+        best = None
+        for s in stocks:
+            value, counts = _best_pattern(lengths, values, demand, s, kerf)
+            if not counts.any():
+                continue
+            score = value / prices.get(s, s)
+            if best is None or score > best[0]:
+                best = (score, s, counts)
+
+        if best is None:
+            break
+
+        _, s, counts = best
+        hit = counts > 0
+        reps = int((demand[hit] // counts[hit]).min())
+        demand -= counts * reps
+
+        cuts = np.repeat(lengths, counts).tolist()
+        bundles.extend((s, list(cuts)) for _ in range(reps))
+
+    return bundles, demand
+
+
+def _column_generation(lengths, demand, stocks, kerf, prices, deadline):
+    """
+    Gilmore-Gomory LP relaxation: revised simplex over cutting patterns,
+    new patterns priced by the knapsack above using the simplex duals.
+
+    Starts from one homogeneous pattern per length, so the basis is always
+    feasible and the best LP found so far is usable when time runs out.
+    Returns [(stock, counts, x)] for the basic patterns.
+    """
+    m = len(lengths)
+    d = demand.astype(float)
+
+    # Homogeneous start: each length alone in its best mm-per-dollar stock
+    B = np.zeros((m, m))
+    cost = np.zeros(m)
+    stock_of = [0] * m
+    for i, l in enumerate(lengths):
+        best = max(stocks, key=lambda s: ((s + kerf) // (l + kerf)) / prices.get(s, s))
+        B[i, i] = (best + kerf) // (l + kerf)
+        cost[i] = prices.get(best, best)
+        stock_of[i] = best
+
+    x = np.linalg.solve(B, d)
+
+    for _ in range(MAX_SIMPLEX_ITERATIONS):
+        if time.perf_counter() >= deadline:
+            break
+
+        y = np.linalg.solve(B.T, cost)
+
+        entering = None
+        for s in stocks:
+            _, counts = _best_pattern(lengths, y, demand, s, kerf)
+            price = prices.get(s, s)
+            reduced = (price - counts @ y) / price
+            if reduced < -1e-9 and (entering is None or reduced < entering[0]):
+                entering = (reduced, s, counts)
+
+        if entering is None:
+            break  # LP optimal
+
+        _, s, counts = entering
+        u = np.linalg.solve(B, counts.astype(float))
+        ok = u > 1e-12
+        if not ok.any():
+            break
+        ratio = np.full(m, np.inf)
+        ratio[ok] = x[ok] / u[ok]
+        r = int(np.argmin(ratio))
+
+        B[:, r] = counts
+        cost[r] = prices.get(s, s)
+        stock_of[r] = s
+        x = np.linalg.solve(B, d)
+
+    return [(stock_of[j], B[:, j].astype(np.int64), x[j]) for j in range(m)]
+
+
+def _residual_bundles(lengths, demand, stocks, kerf, prices, deadline):
+    """Cheapest of pattern heuristic vs best-fit for a (small) leftover demand."""
+    rest = np.repeat(lengths, demand)
+    options = [_bundles_from_plan(best_fit_decreasing(rest, stocks, kerf))]
+
+    bundles, left = _pattern_plan(lengths, lengths.astype(float), demand, stocks, kerf, prices, deadline)
+    if left.sum() == 0:
+        options.append(bundles)
+
+    return min(options, key=lambda b: sum(prices.get(s, s) for s, _ in b))
+
+
+# ============================================================
+# SOLVER
+# ============================================================
+
+def solve_cutting_stock(piece_lengths, stock_lengths, kerf=0, prices=None,
+                        time_budget=DEFAULT_TIME_BUDGET_S):
+    """
+    Near-optimal 1D cutting stock for one profile.
+
+    Greedy best-fit plans are the baseline. Column generation then solves
+    the LP relaxation over cutting patterns within time_budget seconds
+    (keeping the best basis found if time runs out); patterns are rounded
+    down and the leftover pieces are packed by the pattern heuristic or
+    best-fit. The cheapest plan is returned (same columnar shape as
+    best_fit_decreasing, plus 'cost' and 'solver').
+
+    prices: optional {stock mm: price}; default minimises stock mm.
+    """
+    deadline = time.perf_counter() + time_budget
+    prices = {int(k): float(v) for k, v in (prices or {}).items()}
+    stocks = sorted(int(s) for s in stock_lengths)
+    pieces = np.asarray(piece_lengths, dtype=np.int64)
+
+    def finish(plan, solver):
+        plan["cost"] = plan_cost(plan, prices)
+        plan["solver"] = solver
+        return plan
+
+    # Baselines: best-fit over the full stock set and over each length alone
+    candidates = [finish(best_fit_decreasing(pieces, stocks, kerf), "greedy")]
+    longest = int(pieces.max()) if len(pieces) else 0
+    for s in stocks[:-1]:
+        if s >= longest:
+            candidates.append(finish(best_fit_decreasing(pieces, [s], kerf), "greedy"))
+
+    if len(pieces):
+        # Pieces longer than every stock length get a length to themselves
+        oversize = pieces[pieces > stocks[-1]]
+        fit = pieces[pieces <= stocks[-1]]
+
+        lengths, demand = np.unique(fit, return_counts=True)
+        if len(lengths) > MAX_PATTERN_LENGTHS:
+            return min(candidates, key=lambda p: (p["cost"], len(p["stock"])))
+
+        # LP relaxation, then round each pattern down and finish the residual
+        basis = _column_generation(lengths, demand, stocks, kerf, prices, deadline)
+
+        bundles = []
+        left = demand.copy()
+        for s, counts, x in basis:
+            n = int(np.floor(x + 1e-9))
+            if n <= 0 or not counts.any():
+                continue
+            cuts = np.repeat(lengths, counts).tolist()
+            bundles.extend((s, list(cuts)) for _ in range(n))
+            left -= counts * n
+
+        if left.sum():
+            bundles += _residual_bundles(lengths, left, stocks, kerf, prices, deadline)
+        if len(oversize):
+            bundles += _bundles_from_plan(best_fit_decreasing(oversize, stocks, kerf))
+
+        solver = "pattern" if time.perf_counter() < deadline else "pattern (time limit)"
+        candidates.append(finish(_plan_from_bundles(bundles), solver))
+
+    return min(candidates, key=lambda p: (p["cost"], len(p["stock"])))
@@ -0,0 +1,71 @@
+import re
+import numpy as np
+import pandas as pd
+
+# ============================================================
+# FACTORY RULES (single source of truth for frame geometry)
+# ============================================================
+
+LEAF_CLEARANCE_MM = 3       # head gap above the leaf
+DEFAULT_UNDERCUT_MM = 20    # quote-stage undercut (leg = height + 23)
+DEFAULT_FFH_MM = 0
+
+HEAD_GAP_SINGLE_MM = 6      # width + 6
+HEAD_GAP_DOUBLE_MM = 9      # (width * 2) + 9
+
+DEFAULT_JAMB_THICKNESS = 18
+
+
+# ============================================================
+# JAMB THICKNESS
+# ============================================================
+
+def parse_jamb_thickness(jamb):
+    """'US14 92x18 Undershot' -> 18"""
+    m = re.search(r"\d+x(\d+)", str(jamb))
+    return int(m.group(1)) if m else DEFAULT_JAMB_THICKNESS
+
+
+def jamb_thicknesses(jambs):
+    """Vectorized parse_jamb_thickness: parses each distinct jamb once."""
+    codes, uniques = pd.factorize(pd.Series(jambs, dtype=object), use_na_sentinel=False)
+    thk = np.array([parse_jamb_thickness(j) for j in uniques], dtype=np.int64)
+    return thk[codes] if len(thk) else np.zeros(0, dtype=np.int64)
+
+
+# ============================================================
+# LEG / HEAD / FRAME
+# ============================================================
+
+def leg_length(height, undercut=DEFAULT_UNDERCUT_MM, ffh=DEFAULT_FFH_MM):
+    """Leg = leaf height + 3mm clearance + undercut + finished floor height."""
+    return np.asarray(height) + LEAF_CLEARANCE_MM + np.asarray(undercut) + np.asarray(ffh)
+
+
+def head_length(width, jamb_thickness, form):
+    """
+    Single:
+        width + 6mm gap + (jamb_thickness * 2)
+    Double (width is per leaf):
+        (width * 2) + 9mm gap + (jamb_thickness * 2)
+    """
+    width = np.asarray(width)
+    double = np.asarray(form) == "Double"
+    opening = np.where(double, width * 2 + HEAD_GAP_DOUBLE_MM, width + HEAD_GAP_SINGLE_MM)
+    return opening + np.asarray(jamb_thickness) * 2
+
+
+def frame_geometry(height, width, jamb_thickness, form,
+                   undercut=DEFAULT_UNDERCUT_MM, ffh=DEFAULT_FFH_MM):
+    """
+    Arrays (or scalars) in, arrays out.
+
+    Returns:
+        leg_mm    per leg (x2 per frame)
+        head_mm   per head (x1 per frame)
+        frame_m   2 legs + head, in metres (stop is the same length)
+    """
+    leg_mm = leg_length(height, undercut, ffh)
+    head_mm = head_length(width, jamb_thickness, form)
+    frame_m = (leg_mm * 2 + head_mm) / 1000
+    return leg_mm, head_mm, frame_m
@@ -0,0 +1,297 @@
+"""
+Offcut rack: usable waste from committed jobs, kept per profile.
+
+Offcuts live in a small SQLite file (data/offcuts.db). Each profile's
+available offcuts are also held in memory as a sorted [(length, id)]
+list, so "smallest offcut that fits this piece" is a bisect.
+"""
+import json
+import os
+import sqlite3
+from bisect import bisect_left, insort
+from contextlib import contextmanager
+from datetime import datetime
+
+import numpy as np
+
+from core.cutting_stock import solve_cutting_stock, DEFAULT_TIME_BUDGET_S
+
+OFFCUTS_DB = os.path.join("data", "offcuts.db")
+
+# Anything shorter is firewood
+MIN_OFFCUT_MM = 300
+
+# Per-bundle / per-piece arrays of a plan (the rest are scalars)
+PLAN_ARRAYS = ["piece", "bundle", "stock", "used", "offcut"]
+
+
+# ============================================================
+# STORE
+# ============================================================
+
+class OffcutStore:
+    """
+    SQLite-backed offcut rack.
+
+        offcuts(id, profile, length_mm, source, added, used_by, used_at)
+        jobs(job, committed, plans)
+
+    An offcut is available while used_by is NULL. A committed job keeps
+    the plans it was cut from, so it is never re-planned against the
+    rack its own offcuts went back onto.
+    """
+
+    def __init__(self, path=OFFCUTS_DB):
+        self.path = path
+        self._racks = {}  # profile -> sorted [(length, id)]
+        self._versions = {}  # profile -> bumped on every rack change
+
+        folder = os.path.dirname(path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+
+        with self._connect() as con:
+            con.executescript("""
+                CREATE TABLE IF NOT EXISTS offcuts (
+                    id INTEGER PRIMARY KEY,
+                    profile TEXT NOT NULL,
+                    length_mm INTEGER NOT NULL,
+                    source TEXT,
+                    added TEXT,
+                    used_by TEXT,
+                    used_at TEXT
+                );
+                CREATE INDEX IF NOT EXISTS offcuts_available
+                    ON offcuts (profile, used_by, length_mm);
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job TEXT PRIMARY KEY,
+                    committed TEXT,
+                    plans TEXT
+                );
+            """)
+            # Racks made before plans were kept with the job
+            cols = [r[1] for r in con.execute("PRAGMA table_info(jobs)")]
+            if "plans" not in cols:
+                con.execute("ALTER TABLE jobs ADD COLUMN plans TEXT")
+
+    @contextmanager
+    def _connect(self):
+        """One transaction on a fresh connection: commit (or roll back), then close."""
+        con = sqlite3.connect(self.path)
+        try:
+            with con:
+                yield con
+        finally:
+            con.close()
+
+    # --------------------------------------------------------
+    # READS
+    # --------------------------------------------------------
+    def rack(self, profile):
+        """Sorted [(length, id)] of available offcuts for a profile."""
+        if profile not in self._racks:
+            with self._connect() as con:
+                rows = con.execute(
+                    "SELECT length_mm, id FROM offcuts "
+                    "WHERE profile = ? AND used_by IS NULL ORDER BY length_mm, id",
+                    (profile,),
+                ).fetchall()
+            self._racks[profile] = rows
+        return self._racks[profile]
+
+    def version(self, profile):
+        """Changes whenever this profile's rack does (for plan caching)."""
+        return (self.path, profile, self._versions.get(profile, 0))
+
+    def _touch(self, profile):
+        self._versions[profile] = self._versions.get(profile, 0) + 1
+
+    def smallest_at_least(self, profile, length_mm):
+        """Shortest available offcut >= length_mm as (length, id), or None."""
+        rack = self.rack(profile)
+        j = bisect_left(rack, (int(length_mm), -1))
+        return rack[j] if j < len(rack) else None
+
+    def available(self):
+        """Every available offcut as rows: [(id, profile, length_mm, source, added)]."""
+        with self._connect() as con:
+            return con.execute(
+                "SELECT id, profile, length_mm, source, added FROM offcuts "
+                "WHERE used_by IS NULL ORDER BY profile, length_mm"
+            ).fetchall()
+
+    def is_committed(self, job):
+        with self._connect() as con:
+            return con.execute("SELECT 1 FROM jobs WHERE job = ?", (job,)).fetchone() is not None
+
+    def committed_plans(self, job):
+        """{profile: plan} the job was committed with, or None."""
+        with self._connect() as con:
+            row = con.execute("SELECT plans FROM jobs WHERE job = ?", (job,)).fetchone()
+        if row is None or not row[0]:
+            return None
+        return {
+            profile: {k: np.asarray(v, dtype=np.int64) if k in PLAN_ARRAYS else v for k, v in plan.items()}
+            for profile, plan in json.loads(row[0]).items()
+        }
+
+    # --------------------------------------------------------
+    # WRITES
+    # --------------------------------------------------------
+    def add(self, profile, lengths, source=""):
+        """Put offcuts (mm) on the rack; lengths under MIN_OFFCUT_MM are dropped."""
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        keep = [int(l) for l in lengths if int(l) >= MIN_OFFCUT_MM]
+        with self._connect() as con:
+            for l in keep:
+                cur = con.execute(
+                    "INSERT INTO offcuts (profile, length_mm, source, added) VALUES (?, ?, ?, ?)",
+                    (profile, l, source, now),
+                )
+                if profile in self._racks:
+                    insort(self._racks[profile], (l, cur.lastrowid))
+        if keep:
+            self._touch(profile)
+        return len(keep)
+
+    def commit_job(self, job, plans):
+        """
+        Job is going to the saw: take its offcuts off the rack and put the
+        new offcuts back. plans: {profile: plan from plan_with_offcuts},
+        kept with the job (see committed_plans).
+
+        Returns (offcuts used, offcuts added).
+        """
+        if not job:
+            raise ValueError("Save or load the quote first: offcuts are committed against its quote number")
+
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        used, added = 0, []
+
+        with self._connect() as con:
+            if con.execute("SELECT 1 FROM jobs WHERE job = ?", (job,)).fetchone():
+                raise ValueError(f"{job} has already been committed to the offcut rack")
+
+            for profile, plan in plans.items():
+                ids = [int(i) for i in plan["offcut"] if i >= 0]
+                if ids:
+                    marks = ",".join("?" * len(ids))
+                    cur = con.execute(
+                        f"UPDATE offcuts SET used_by = ?, used_at = ? "
+                        f"WHERE used_by IS NULL AND id IN ({marks})",
+                        [job, now] + ids,
+                    )
+                    if cur.rowcount != len(ids):
+                        con.rollback()
+                        raise ValueError(
+                            f"Offcuts for {profile} were used by another job; re-plan the cut list"
+                        )
+                    used += len(ids)
+
+                for l in offcut_lengths(plan, plan.get("kerf", 0)):
+                    added.append((profile, int(l), job, now))
+
+            con.executemany(
+                "INSERT INTO offcuts (profile, length_mm, source, added) VALUES (?, ?, ?, ?)",
+                added,
+            )
+            con.execute(
+                "INSERT INTO jobs (job, committed, plans) VALUES (?, ?, ?)",
+                (job, now, json.dumps({p: _plan_json(plan) for p, plan in plans.items()})),
+            )
+
+        # Rebuilt lazily from the database
+        for profile in plans:
+            self._racks.pop(profile, None)
+            self._touch(profile)
+
+        return used, len(added)
+
+
+def _plan_json(plan):
+    return {
+        k: v.tolist() if isinstance(v, np.ndarray) else v.item() if isinstance(v, np.generic) else v
+        for k, v in plan.items()
+    }
+
+
+_STORES = {}
+
+
+def get_offcut_store(path=OFFCUTS_DB):
+    """One store per file for the whole process."""
+    key = os.path.abspath(path)
+    if key not in _STORES:
+        _STORES[key] = OffcutStore(path)
+    return _STORES[key]
+
+
+# ============================================================
+# PLANNING
+# ============================================================
+
+def offcut_lengths(plan, kerf=0):
+    """Physical leftover per bundle (every cut takes kerf) that is worth keeping."""
+    cuts = np.bincount(plan["bundle"], minlength=len(plan["stock"]))
+    left = plan["stock"] - plan["used"] - cuts * kerf
+    return left[left >= MIN_OFFCUT_MM]
+
+
+def cut_from_offcuts(piece_lengths, rack, kerf=0):
+    """
+    Longest piece first, each into the shortest offcut (or what is left
+    of one) that still fits it. rack is not modified.
+
+    Returns (offcut bundles [(offcut id, length, [cuts])], pieces left over)
+    """
+    pieces = np.sort(np.asarray(piece_lengths, dtype=np.int64))[::-1]
+    room = [(l + kerf, i) for l, i in rack]  # same capacity rule as best_fit_decreasing
+    bundles = {}
+    left = []
+
+    for p in pieces.tolist():
+        j = bisect_left(room, (p + kerf, -1))
+        if j == len(room):
+            left.append(p)
+            continue
+
+        rem, oid = room.pop(j)
+        if oid not in bundles:
+            bundles[oid] = (rem - kerf, [])
+        bundles[oid][1].append(p)
+
+        rem -= p + kerf
+        if rem > kerf:
+            insort(room, (rem, oid))
+
+    return [(oid, l, cuts) for oid, (l, cuts) in bundles.items()], np.asarray(left, dtype=np.int64)
+
+
+def plan_with_offcuts(piece_lengths, stock_lengths, rack, kerf=0, prices=None,
+                      time_budget=DEFAULT_TIME_BUDGET_S):
+    """
+    Cut what we can from the offcut rack, then solve the rest from new
+    stock. Same columnar plan as solve_cutting_stock plus, per bundle:
+        offcut  offcut id (-1 = new stock)
+    Offcut bundles come first.
+    """
+    bundles, rest = cut_from_offcuts(piece_lengths, rack, kerf)
+    new = solve_cutting_stock(rest, stock_lengths, kerf=kerf, prices=prices, time_budget=time_budget)
+
+    n_off = len(bundles)
+    piece = [c for _, _, cuts in bundles for c in cuts]
+    owner = [b for b, (_, _, cuts) in enumerate(bundles) for _ in cuts]
+
+    return {
+        "piece": np.concatenate([np.asarray(piece, dtype=np.int64), new["piece"]]),
+        "bundle": np.concatenate([np.asarray(owner, dtype=np.int64), new["bundle"] + n_off]),
+        "stock": np.concatenate([np.asarray([l for _, l, _ in bundles], dtype=np.int64), new["stock"]]),
+        "used": np.concatenate([np.asarray([sum(c) for _, _, c in bundles], dtype=np.int64), new["used"]]),
+        "offcut": np.concatenate([
+            np.asarray([oid for oid, _, _ in bundles], dtype=np.int64),
+            np.full(len(new["stock"]), -1, dtype=np.int64),
+        ]),
+        "kerf": kerf,
+        "cost": new["cost"],
+        "solver": new["solver"],
+    }
@@ -0,0 +1,199 @@
+"""
+Memo cache for cut-list plans and stock summaries.
+
+Streamlit reruns the whole production tab on every click, so plans are
+keyed on what they depend on (the multiset of piece lengths, stock
+lengths, kerf, prices, time budget and offcut rack state) and kept in a
+small LRU. Editing one door only changes the key of its own profile.
+
+Cached plans are shared: callers must not modify them.
+"""
+import atexit
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+from core.cutting_stock import solve_cutting_stock, DEFAULT_TIME_BUDGET_S
+from core.offcuts import plan_with_offcuts
+from core.stock import strategy_mix
+
+PLAN_CACHE_SIZE = 64
+SUMMARY_CACHE_SIZE = 64
+
+# Below this many pieces to solve a pool costs more than it saves
+MIN_POOL_PIECES = 1500
+
+
+# ============================================================
+# LRU
+# ============================================================
+
+class LRUCache:
+    """Tiny LRU: OrderedDict, most recently used last."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        if key in self._data:
+            self._data.move_to_end(key)
+            self.hits += 1
+            return self._data[key]
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self):
+        self._data.clear()
+        self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+
+_PLANS = LRUCache(PLAN_CACHE_SIZE)
+_SUMMARIES = LRUCache(SUMMARY_CACHE_SIZE)
+
+
+# ============================================================
+# KEYS
+# ============================================================
+
+def pieces_key(piece_lengths):
+    """Order-independent hash of a multiset of piece lengths (mm)."""
+    lengths, counts = np.unique(np.asarray(piece_lengths, dtype=np.int64), return_counts=True)
+    h = hashlib.sha1(lengths.tobytes())
+    h.update(counts.astype(np.int64).tobytes())
+    return h.hexdigest()
+
+
+def _options_key(*parts):
+    blob = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()
+
+
+# ============================================================
+# CACHED SOLVES
+# ============================================================
+
+def _plan_key(piece_lengths, stock_lengths, kerf=0, prices=None,
+              time_budget=DEFAULT_TIME_BUDGET_S, rack=None, rack_version=None):
+    return (
+        pieces_key(piece_lengths),
+        _options_key(
+            sorted(int(s) for s in stock_lengths), int(kerf),
+            sorted((int(k), float(v)) for k, v in (prices or {}).items()),
+            float(time_budget), rack_version if rack is not None else None,
+        ),
+    )
+
+
+def _solve(piece_lengths, stock_lengths, kerf=0, prices=None,
+           time_budget=DEFAULT_TIME_BUDGET_S, rack=None, rack_version=None):
+    if rack is None:
+        return solve_cutting_stock(
+            piece_lengths, stock_lengths,
+            kerf=kerf, prices=prices, time_budget=time_budget
+        )
+    return plan_with_offcuts(
+        piece_lengths, stock_lengths, rack,
+        kerf=kerf, prices=prices, time_budget=time_budget
+    )
+
+
+def _solve_task(task):
+    return _solve(**task)
+
+
+def cached_cut_plan(piece_lengths, stock_lengths, kerf=0, prices=None,
+                    time_budget=DEFAULT_TIME_BUDGET_S, rack=None, rack_version=None):
+    """
+    solve_cutting_stock (or plan_with_offcuts when a rack is given), memoised.
+
+    rack_version must change whenever the rack does (see
+    OffcutStore.version); it stands in for hashing the whole rack.
+    """
+    return solve_cut_plans([dict(
+        piece_lengths=piece_lengths, stock_lengths=stock_lengths, kerf=kerf,
+        prices=prices, time_budget=time_budget, rack=rack, rack_version=rack_version,
+    )], workers=1)[0]
+
+
+def solve_cut_plans(tasks, workers=None):
+    """
+    Many independent cut plans (one per profile) at once.
+
+    tasks: list of cached_cut_plan keyword dicts. Cache hits return
+    straight away; the misses are solved across a process pool when there
+    is enough work, else in this process. Plans come back in task order.
+    """
+    keys = [_plan_key(**t) for t in tasks]
+    plans = [_PLANS.get(k) for k in keys]
+    todo = [i for i, p in enumerate(plans) if p is None]
+
+    workers = workers or os.cpu_count() or 1
+    n_pieces = sum(len(tasks[i]["piece_lengths"]) for i in todo)
+
+    if workers == 1 or len(todo) < 2 or n_pieces < MIN_POOL_PIECES:
+        solved = [_solve(**tasks[i]) for i in todo]
+    else:
+        try:
+            solved = list(_pool(workers).map(_solve_task, [tasks[i] for i in todo]))
+        except (BrokenProcessPool, OSError):
+            # No processes on this host (or a worker died): solve here
+            _POOL["pool"] = None
+            solved = [_solve(**tasks[i]) for i in todo]
+
+    for i, plan in zip(todo, solved):
+        _PLANS.put(keys[i], plan)
+        plans[i] = plan
+    return plans
+
+
+_POOL = {"pool": None, "workers": 0}
+
+
+def _pool(workers):
+    """Long-lived worker pool, so Streamlit reruns don't pay for start-up."""
+    if _POOL["pool"] is None or _POOL["workers"] != workers:
+        if _POOL["pool"] is not None:
+            _POOL["pool"].shutdown(cancel_futures=True)
+        _POOL["pool"] = ProcessPoolExecutor(max_workers=workers)
+        _POOL["workers"] = workers
+    return _POOL["pool"]
+
+
+@atexit.register
+def _shutdown_pool():
+    if _POOL["pool"] is not None:
+        _POOL["pool"].shutdown(cancel_futures=True)
+
+
+def cached_strategy_mix(total_m, strategy, prices=None):
+    """strategy_mix, memoised on the (mm-rounded) totals."""
+    total_mm = np.rint(np.asarray(total_m, dtype=float) * 1000).astype(np.int64)
+    key = (total_mm.tobytes(), strategy, _options_key(sorted((prices or {}).items())))
+
+    hit = _SUMMARIES.get(key)
+    if hit is None:
+        hit = strategy_mix(total_m, strategy, prices)
+        _SUMMARIES.put(key, hit)
+    return hit
+
+
+def clear_plan_cache():
+    _PLANS.clear()
+    _SUMMARIES.clear()
@@ -1,5 +1,7 @@
+import numpy as np
 import pandas as pd
-import re
+
+from core.geometry import frame_geometry, parse_jamb_thickness
 
 # ---------------------------------------------
 # Handle width ranges in your price tables
@@ -25,11 +27,52 @@ def leaf_price(df, height, width, thickness):
     return float(price) if not pd.isna(price) else 0.0
 
 # ---------------------------------------------
-# Extract jamb thickness
+# Compiled leaf price book
+#   (leaf type, height, width band, thickness) -> price
+#   Rebuilt only when the leaf tables change
+#   (settings["door_leaf_prices_version"] is bumped by the Settings tab).
 # ---------------------------------------------
-def parse_jamb_thickness(jamb):
-    m = re.search(r"\d+x(\d+)", jamb)
-    return int(m.group(1)) if m else 18
+_BOOK_CACHE = {}
+_BOOK_CACHE_MAX = 32
+
+
+def compile_price_book(door_leaf_prices):
+    book = {}
+    for leaf_type, df in door_leaf_prices.items():
+        if df is None or df.empty:
+            continue
+        thick_cols = [c for c in df.columns if c not in ("Height", "Width")]
+        heights = df["Height"].astype(str).str.strip().tolist()
+        widths = df["Width"].astype(str).str.strip().tolist()
+
+        for col in thick_cols:
+            prices = pd.to_numeric(df[col], errors="coerce").tolist()
+            for h, w, p in zip(heights, widths, prices):
+                key = (leaf_type, h, w, col)
+                # First matching row wins, same as leaf_price
+                if key not in book:
+                    book[key] = 0.0 if pd.isna(p) else float(p)
+    return book
+
+
+def get_price_book(settings):
+    tables = settings["door_leaf_prices"]
+    version = settings.get("door_leaf_prices_version", 0)
+
+    hit = _BOOK_CACHE.get(id(tables))
+    if hit is not None and hit[0] is tables and hit[1] == version:
+        return hit[2]
+
+    book = compile_price_book(tables)
+    if len(_BOOK_CACHE) >= _BOOK_CACHE_MAX:
+        _BOOK_CACHE.clear()
+    _BOOK_CACHE[id(tables)] = (tables, version, book)
+    return book
+
+
+def book_leaf_price(book, leaf_type, height, width, thickness):
+    """O(1) leaf price lookup. Returns None for POA."""
+    return book.get((leaf_type, str(height), width_band(width), thickness))
 
 # ---------------------------------------------
 # Frame lengths + cost
@@ -37,18 +80,8 @@ def parse_jamb_thickness(jamb):
 def frame_cost_and_pieces(height, width, jamb, form, prices, min_charge):
     jamb_thk = parse_jamb_thickness(jamb)
 
-    # Legs
-    leg_len_mm = height + 23
-
-    # Head
-    if form == "Double":
-        head_len_mm = (width * 2) + 9 + (jamb_thk * 2)
-    else:
-        head_len_mm = width + 6 + (jamb_thk * 2)
-
-    # Total frame length
-    total_mm = (leg_len_mm * 2) + head_len_mm
-    frame_m = total_mm / 1000
+    leg, head, frame = frame_geometry(height, width, jamb_thk, form)
+    leg_len_mm, head_len_mm, frame_m = int(leg), int(head), float(frame)
 
     raw_cost = frame_m * prices[jamb]
     cost = max(raw_cost, min_charge)
@@ -61,3 +94,115 @@ def frame_cost_and_pieces(height, width, jamb, form, prices, min_charge):
 def stop_cost(frame_m, stop_rate, minimum):
     raw = frame_m * stop_rate
     return max(raw, minimum)
+
+# ---------------------------------------------
+# Batch pricing (whole quote tables)
+# ---------------------------------------------
+HINGES_PER_LEAF = 3     # rule: all standard doors = 3 hinges per leaf
+SCREWS_PER_HINGE = 6
+
+COST_COLUMNS = [
+    "Unit Cost", "Total Cost",
+    "Leaf Cost", "Frame Cost", "Stop Cost", "Labour",
+    "Hinges", "Hinge Cost", "Screws", "Screw Cost",
+    "Frame Length (m)", "Leg Length (mm)", "Head Length (mm)",
+]
+
+
+# Settings price_lines reads; nothing else changes a price
+PRICE_SETTINGS = [
+    "door_leaf_prices",
+    "frame_prices",
+    "minimum_frame_charge",
+    "stop_price",
+    "labour_single",
+    "labour_double",
+    "hinge_price",
+    "screw_cost",
+]
+
+
+def price_lines(lines, settings):
+    """
+    Price N door lines at once.
+
+    Expects columns:
+        ['Leaf Type', 'Thickness', 'Height', 'Width',
+         'Jamb Type', 'Form', 'Qty']
+    Optional 'Leaf Price' (per leaf) overrides the price book, e.g. POA.
+
+    Returns:
+        costs   DataFrame of COST_COLUMNS, same index as lines
+        poa     bool ndarray, True where no leaf price was found
+                (their cost columns are NaN)
+    """
+    n = len(lines)
+    height = lines["Height"].to_numpy(dtype=np.int64)
+    width = lines["Width"].to_numpy(dtype=np.int64)
+    qty = lines["Qty"].to_numpy(dtype=np.int64)
+    double = (lines["Form"] == "Double").to_numpy()
+
+    # Leaf — one hash probe per line against the compiled book
+    book = get_price_book(settings)
+    band = np.where((width >= 410) & (width <= 810), "410-810", width.astype(str))
+    keys = pd.MultiIndex.from_arrays([
+        lines["Leaf Type"].to_numpy(dtype=object),
+        height.astype(str).astype(object),
+        band.astype(object),
+        lines["Thickness"].to_numpy(dtype=object),
+    ])
+    book_keys = pd.MultiIndex.from_tuples(list(book.keys())) if book else None
+    book_prices = np.fromiter(book.values(), dtype=float, count=len(book))
+
+    leaf_unit = np.full(n, np.nan)
+    if book_keys is not None and n:
+        pos = book_keys.get_indexer(keys)
+        hit = pos >= 0
+        leaf_unit[hit] = book_prices[pos[hit]]
+
+    if "Leaf Price" in lines.columns:
+        override = pd.to_numeric(lines["Leaf Price"], errors="coerce").to_numpy(dtype=float)
+        leaf_unit = np.where(np.isnan(override), leaf_unit, override)
+
+    poa = np.isnan(leaf_unit)
+
+    # Jambs — resolve thickness + price once per distinct jamb type
+    codes, jambs = pd.factorize(lines["Jamb Type"])
+    unknown = [j for j in jambs if j not in settings["frame_prices"]]
+    if unknown:
+        raise ValueError(f"No frame price for jamb type(s): {', '.join(map(str, unknown))}")
+    jamb_thk = np.array([parse_jamb_thickness(j) for j in jambs], dtype=np.int64)[codes]
+    jamb_rate = np.array([settings["frame_prices"][j] for j in jambs], dtype=float)[codes]
+
+    leg_mm, head_mm, frame_m = frame_geometry(height, width, jamb_thk, lines["Form"].to_numpy())
+
+    frame = np.maximum(frame_m * jamb_rate, settings["minimum_frame_charge"])
+    stop = np.maximum(frame_m * settings["stop_price"], 0)
+    labour = np.where(double, settings["labour_double"], settings["labour_single"]).astype(float)
+
+    leaves = np.where(double, 2, 1)
+    hinges = HINGES_PER_LEAF * leaves
+    screws = hinges * SCREWS_PER_HINGE
+    hinge_cost = hinges * settings["hinge_price"]
+    screw_cost = screws * settings["screw_cost"]
+
+    leaf = leaf_unit * leaves
+    unit = leaf + frame + stop + labour + hinge_cost + screw_cost
+
+    costs = pd.DataFrame({
+        "Unit Cost": unit,
+        "Total Cost": unit * qty,
+        "Leaf Cost": leaf,
+        "Frame Cost": frame,
+        "Stop Cost": stop,
+        "Labour": labour,
+        "Hinges": hinges,
+        "Hinge Cost": hinge_cost,
+        "Screws": screws,
+        "Screw Cost": screw_cost,
+        "Frame Length (m)": frame_m,
+        "Leg Length (mm)": leg_mm,
+        "Head Length (mm)": head_mm,
+    }, index=lines.index)
+
+    return costs, poa
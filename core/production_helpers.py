@@ -1,6 +1,16 @@
 
 import pandas as pd
-import math
+import numpy as np
+
+from core.stock import strategy_mix
+from core.geometry import (
+    leg_length,
+    head_length,
+    frame_geometry,
+    jamb_thicknesses,
+    DEFAULT_UNDERCUT_MM,
+    DEFAULT_FFH_MM
+)
 
 # ============================================================
 # HEIGHT CALCULATION
@@ -10,8 +20,9 @@ def calc_final_height(leaf_height, undercut, finished_floor_height):
     """
     Production height:
     leaf_height + 3mm clearance + undercut + finished_floor_height
+    (see core.geometry.leg_length)
     """
-    return leaf_height + 3 + undercut + finished_floor_height
+    return leg_length(leaf_height, undercut, finished_floor_height)
 
 
 # ============================================================
@@ -23,12 +34,10 @@ def calc_head_length(width, jamb_thickness, form):
     Single:
         width + 6mm gap + (jamb_thickness * 2)
     Double:
-        width + 3mm gap + (jamb_thickness * 2)
+        (width * 2) + 9mm gap + (jamb_thickness * 2)
+    (see core.geometry.head_length — same rule the pricing uses)
     """
-    if form == "Single":
-        return width + 6 + (jamb_thickness * 2)
-    else:
-        return width + 3 + (jamb_thickness * 2)
+    return head_length(width, jamb_thickness, form)
 
 
 # ============================================================
@@ -47,7 +56,7 @@ def calc_frame_lengths(leg_mm, head_mm, qty):
         total_stop_m (same as frame)
     """
 
-    frame_mm_per_door = (leg_mm * 2) + head_mm
+    frame_mm_per_door = (np.asarray(leg_mm) * 2) + np.asarray(head_mm)
     frame_m_per_door = frame_mm_per_door / 1000
 
     total_frame_m = frame_m_per_door * qty
@@ -56,6 +65,246 @@ def calc_frame_lengths(leg_mm, head_mm, qty):
     return frame_m_per_door, total_frame_m, total_stop_m
 
 
+# ============================================================
+# QUOTE LINES -> PHYSICAL DOORS
+# ============================================================
+
+DOOR_CATEGORICALS = ["SKU", "LeafType", "JambType", "Form"]
+
+
+def door_numbers(n):
+    """Door # for n physical doors in quote-line order: '1'..'n' (the measurement template uses these too)."""
+    return np.arange(1, n + 1).astype(str).astype(object)
+
+
+def expand_quote_rows(og_df):
+    """Build rows for measurement editor (one per physical door)."""
+    qty = og_df["Qty"].astype(int).clip(lower=0).to_numpy()
+    take = np.repeat(np.arange(len(og_df)), qty)
+    n = len(take)
+
+    quote_line = og_df.index.to_numpy()[take]
+    if pd.api.types.is_integer_dtype(quote_line):
+        quote_line = quote_line.astype(np.int32)
+
+    doors = pd.DataFrame({
+        "Door #": door_numbers(n),
+        "QuoteLine": quote_line,
+        "SKU": og_df["SKU"].to_numpy()[take],
+        "LeafType": og_df["Leaf Type"].to_numpy()[take],
+        "Height": og_df["Height"].to_numpy()[take].astype(np.int16),
+        "Width": og_df["Width"].to_numpy()[take].astype(np.int16),
+        "JambType": og_df["Jamb Type"].to_numpy()[take],
+        "Form": og_df["Form"].to_numpy()[take],
+        "Undercut": np.full(n, DEFAULT_UNDERCUT_MM, dtype=np.int16),
+        "FinishedFloorHeight": np.full(n, DEFAULT_FFH_MM, dtype=np.int16),
+        "Measured": np.zeros(n, dtype=bool),
+    })
+
+    # Few distinct values repeated per door -> categoricals
+    doors[DOOR_CATEGORICALS] = doors[DOOR_CATEGORICALS].astype("category")
+
+    return doors
+
+
+# ============================================================
+# PER-DOOR PRODUCTION CALCULATIONS (COLUMNAR)
+# ============================================================
+
+PRODUCTION_COLUMNS = [
+    "Door #", "QuoteLine", "LeafType", "LeafHeight", "LeafThickness",
+    "FinalHeight", "Width", "JambType", "Form",
+    "Leg (mm)", "Head (mm)", "Total Frame (m)", "Total Stop (m)",
+    "Hinges", "Measured",
+]
+
+
+def build_production_calcs(doors, og_df):
+    """
+    One row per physical door -> leg/head/frame/stop lengths.
+
+    doors: measurement editor rows
+        ['Door #', 'QuoteLine', 'LeafType', 'Height', 'Width',
+         'JambType', 'Form', 'Undercut', 'FinishedFloorHeight', 'Measured']
+    og_df: quote lines (index = QuoteLine), for Hinges + Thickness
+    """
+    d = doors.copy()
+    for c in ["Height", "Width"]:
+        d[c] = pd.to_numeric(d[c], errors="coerce")
+    d = d.dropna(subset=["Height", "Width"])
+
+    undercut = pd.to_numeric(d["Undercut"], errors="coerce").fillna(DEFAULT_UNDERCUT_MM)
+    ffh = pd.to_numeric(d["FinishedFloorHeight"], errors="coerce").fillna(DEFAULT_FFH_MM)
+
+    has_line = "QuoteLine" in d.columns
+    line = d["QuoteLine"] if has_line else pd.Series(0, index=d.index)
+
+    # Hash join on QuoteLine instead of og_df.loc per door
+    quote = og_df[["Hinges", "Thickness"]]
+    pos = quote.index.get_indexer(line)
+    hit = pos >= 0
+    hinges = np.zeros(len(d), dtype=np.int64)
+    thickness = np.full(len(d), None, dtype=object)
+    if has_line:
+        hinges[hit] = quote["Hinges"].to_numpy()[pos[hit]]
+    thickness[hit] = quote["Thickness"].to_numpy()[pos[hit]]
+
+    height = d["Height"].to_numpy(dtype=np.int64)
+    leg_mm, head_mm, frame_m = frame_geometry(
+        height,
+        d["Width"].to_numpy(dtype=np.int64),
+        jamb_thicknesses(d["JambType"].to_numpy()),
+        d["Form"].to_numpy(),
+        undercut=undercut.to_numpy(dtype=np.int64),
+        ffh=ffh.to_numpy(dtype=np.int64),
+    )
+
+    return pd.DataFrame({
+        "Door #": d["Door #"].to_numpy(),
+        "QuoteLine": line.to_numpy(),
+        "LeafType": d["LeafType"].to_numpy(),
+        "LeafHeight": height,
+        "LeafThickness": thickness,
+        "FinalHeight": leg_mm,
+        "Width": d["Width"].to_numpy(dtype=np.int64),
+        "JambType": d["JambType"].to_numpy(),
+        "Form": d["Form"].to_numpy(),
+        "Leg (mm)": leg_mm,
+        "Head (mm)": head_mm,
+        "Total Frame (m)": frame_m,
+        "Total Stop (m)": frame_m,  # stop = same length as frame
+        "Hinges": hinges,
+        "Measured": d["Measured"].to_numpy(),
+    }, columns=PRODUCTION_COLUMNS)
+
+
+# ============================================================
+# SITE MEASUREMENTS -> DOOR TABLE
+# ============================================================
+
+MEASUREMENT_COLUMNS = ["Undercut", "FinishedFloorHeight"]
+
+
+def _differs(a, b):
+    """Element-wise a != b where NaN == NaN."""
+    a = pd.to_numeric(pd.Series(a), errors="coerce").to_numpy(dtype=float)
+    b = pd.to_numeric(pd.Series(b), errors="coerce").to_numpy(dtype=float)
+    return ~((a == b) | (np.isnan(a) & np.isnan(b)))
+
+
+def merge_measurements(doors, measured):
+    """
+    Join imported site measurements onto the door table by Door #.
+
+    measured: ['Door #', 'Undercut', 'FinishedFloorHeight'], optionally
+    'Row' (sheet row, see import_xlsx_measurements). Blank measurements
+    keep the door's value; every matched door is flagged Measured. Door
+    order is unchanged.
+
+    Returns (doors, report):
+        matched / updated       counts
+        changed                 Door #s whose measurements moved
+        unmatched               imported Door #s not in the door table
+        blank                   rows (sheet row, else position) with no Door #
+        duplicates              Door #s imported more than once (last wins)
+        duplicate_doors         Door #s repeated in the door table (first used)
+    """
+    doors = doors.copy()
+    ids = doors["Door #"].astype(str).str.strip()
+
+    imp = measured.assign(**{"Door #": measured["Door #"].fillna("").astype(str).str.strip()})
+    no_door = imp["Door #"].isin(["", "nan", "None"])
+    blank = (
+        imp.loc[no_door, "Row"] if "Row" in imp.columns
+        else pd.Series(np.flatnonzero(no_door.to_numpy()) + 1)
+    ).astype(int).tolist()
+    imp = imp[~no_door]
+
+    dup_import = imp.loc[imp["Door #"].duplicated(keep=False), "Door #"].unique().tolist()
+    imp = imp.drop_duplicates("Door #", keep="last")
+
+    dup_doors = ids[ids.duplicated(keep=False)].unique().tolist()
+    first = ~ids.duplicated(keep="first").to_numpy()
+    index = pd.Index(ids.to_numpy()[first])
+    rows = np.flatnonzero(first)
+
+    pos = index.get_indexer(imp["Door #"])
+    hit = pos >= 0
+    target = rows[pos[hit]]
+
+    changed = np.zeros(len(doors), dtype=bool)
+    for col in MEASUREMENT_COLUMNS:
+        if col not in imp.columns:
+            continue
+        new = pd.to_numeric(imp[col], errors="coerce").to_numpy(dtype=float)[hit]
+        old = pd.to_numeric(doors[col], errors="coerce").to_numpy(dtype=float)[target]
+        new = np.where(np.isnan(new), old, new)
+
+        moved = _differs(old, new)
+        changed[target[moved]] = True
+
+        values = pd.to_numeric(doors[col], errors="coerce").to_numpy(dtype=float)
+        values[target] = new
+        doors[col] = values if np.isnan(values).any() else values.astype(np.int64)
+
+    measured_col = doors["Measured"].fillna(False).astype(bool).to_numpy()
+    measured_col[target] = True
+    doors["Measured"] = measured_col
+
+    report = {
+        "matched": int(hit.sum()),
+        "updated": int(changed.sum()),
+        "changed": ids[changed].tolist(),
+        "unmatched": imp.loc[~hit, "Door #"].tolist(),
+        "blank": blank,
+        "duplicates": dup_import,
+        "duplicate_doors": dup_doors,
+    }
+    return doors, report
+
+
+def refresh_production_calcs(prev_doors, prev_calc, doors, og_df):
+    """
+    build_production_calcs, recomputing only doors that differ from the
+    previous door table (matched on Door #). Falls back to a full build
+    when there is nothing to reuse or Door #s aren't unique.
+
+    Returns (calc DataFrame, number of doors recomputed)
+    """
+    ids = doors["Door #"].astype(str)
+
+    if prev_doors is None or prev_calc is None or ids.duplicated().any() \
+            or list(prev_doors.columns) != list(doors.columns):
+        return build_production_calcs(doors, og_df), len(doors)
+
+    prev_ids = pd.Index(prev_doors["Door #"].astype(str))
+    if prev_ids.has_duplicates:
+        return build_production_calcs(doors, og_df), len(doors)
+
+    pos = prev_ids.get_indexer(ids)
+    dirty = pos < 0
+    hit = ~dirty
+    # Measured is only carried through, so it is patched, not recomputed
+    for col in doors.columns.drop("Measured", errors="ignore"):
+        a = doors[col].to_numpy(dtype=object)[hit]
+        b = prev_doors[col].to_numpy(dtype=object)[pos[hit]]
+        same = (a == b) | (pd.isna(a) & pd.isna(b))
+        dirty[np.flatnonzero(hit)[~same]] = True
+
+    if not dirty.any() and len(prev_ids) == len(ids) \
+            and prev_doors["Measured"].equals(doors["Measured"]):
+        return prev_calc, 0
+
+    fresh = build_production_calcs(doors[dirty], og_df)
+    keep = prev_calc[prev_calc["Door #"].astype(str).isin(ids[~dirty])]
+
+    calc = pd.concat([keep, fresh], ignore_index=True)
+    order = pd.Index(ids).get_indexer(calc["Door #"].astype(str))
+    calc = calc.iloc[np.argsort(order, kind="stable")].reset_index(drop=True)
+    calc["Measured"] = doors["Measured"].to_numpy()[np.sort(order)]
+    return calc, int(dirty.sum())
+
+
 # ============================================================
 # GROUPING PRODUCTION MEASUREMENTS
 # ============================================================
@@ -74,9 +323,8 @@ def group_production_rows(df):
     df = df.copy()
 
     # Compute final height
-    df["FinalHeight"] = df.apply(
-        lambda r: calc_final_height(r["LeafHeight"], r["Undercut"], r["FinishedFloorHeight"]),
-        axis=1
+    df["FinalHeight"] = calc_final_height(
+        df["LeafHeight"].to_numpy(), df["Undercut"].to_numpy(), df["FinishedFloorHeight"].to_numpy()
     )
 
     # Group
@@ -101,42 +349,11 @@ def group_production_rows(df):
 def apply_stock_strategy(total_m, strategy):
     """
     Returns: (count_54, count_21, waste_m)
-    """
 
-    def only_54(m):
-        c = math.ceil(m / 5.4)
-        waste = c * 5.4 - m
-        return c, 0, waste
-
-    def only_21(m):
-        c = math.ceil(m / 2.1)
-        waste = c * 2.1 - m
-        return 0, c, waste
-
-    def mix_lengths(m):
-        remaining = m
-        count_54 = 0
-        count_21 = 0
-
-        # Greedy: use as many 5.4s as possible
-        while remaining > 5.4:
-            count_54 += 1
-            remaining -= 5.4
-
-        # Then use 2.1s
-        while remaining > 0:
-            count_21 += 1
-            remaining -= 2.1
-
-        waste = abs(remaining)
-        return count_54, count_21, waste
-
-    if strategy == "Only 5.4":
-        return only_54(total_m)
-    elif strategy == "Only 2.1":
-        return only_21(total_m)
-    else:
-        return mix_lengths(total_m)
+    Exact minimum-waste mix in integer mm (see core.stock.stock_mix).
+    """
+    count_54, count_21, waste_m = strategy_mix(total_m, strategy)
+    return int(count_54[0]), int(count_21[0]), float(waste_m[0])
 
 
 # ============================================================
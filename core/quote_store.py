@@ -0,0 +1,386 @@
+"""
+Saved quotes: where they live.
+
+Two interchangeable backends behind the core.save_load functions:
+
+    SqliteQuoteStore  data/quotes.db (default). Header columns are
+                      indexed, rows sit in a child table, and the next
+                      quote number is a counter, not a scan.
+    JsonQuoteStore    the original one-JSON-file-per-quote folder.
+
+Pick with the QUOTE_STORE environment variable ("sqlite" or "json").
+Existing JSON quotes are copied into a new SQLite store the first time
+it is created; to re-run that by hand:
+
+    python -m core.quote_store migrate [quotes_dir] [db_path]
+"""
+import json
+import os
+import sqlite3
+import sys
+from contextlib import contextmanager
+
+QUOTES_DIR = "quotes"
+QUOTES_DB = os.path.join("data", "quotes.db")
+
+# Header fields with their own indexed columns
+HEADER_FIELDS = ["q_number", "customer", "project", "timestamp"]
+
+# Row lists kept in the quote_rows child table
+ROW_KINDS = ["raw_rows", "recalculated_rows"]
+
+
+def q_number_int(qnum):
+    """Numeric part of a quote number ('Q0042' -> 42), or None."""
+    try:
+        return int(str(qnum).replace("Q", "").strip())
+    except ValueError:
+        return None
+
+
+def format_q_number(n):
+    return f"Q{n:04d}"
+
+
+# ============================================================
+# JSON FOLDER
+# ============================================================
+
+class JsonQuoteStore:
+    """One indented JSON file per quote, named <q_number>.json."""
+
+    def __init__(self, folder=QUOTES_DIR):
+        self.folder = folder
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+
+    def _path(self, qnum):
+        return os.path.join(self.folder, f"{qnum}.json")
+
+    def q_numbers(self):
+        files = [f for f in os.listdir(self.folder) if f.endswith(".json")]
+        return sorted(f[:-len(".json")] for f in files)
+
+    def next_q_number(self):
+        nums = [n for n in map(q_number_int, self.q_numbers()) if n is not None]
+        return format_q_number(max(nums) + 1 if nums else 1)
+
+    def headers(self, customer=None, project=None):
+        """Header dicts, newest first (reads every file)."""
+        out = []
+        for qnum in self.q_numbers():
+            data = self.load(qnum) or {}
+            if customer is not None and data.get("customer") != customer:
+                continue
+            if project is not None and data.get("project") != project:
+                continue
+            out.append({k: data.get(k, qnum if k == "q_number" else None) for k in HEADER_FIELDS})
+        return sorted(out, key=lambda h: h["timestamp"] or "", reverse=True)
+
+    def load(self, qnum):
+        path = self._path(qnum)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def save(self, data):
+        with open(self._path(data["q_number"]), "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=4)
+
+    def update(self, qnum, fields):
+        data = self.load(qnum)
+        if data is None:
+            return False
+        data.update(fields)
+        self.save(data)
+        return True
+
+    def delete(self, qnum):
+        path = self._path(qnum)
+        if os.path.exists(path):
+            os.remove(path)
+            return True
+        return False
+
+
+# ============================================================
+# SQLITE
+# ============================================================
+
+class SqliteQuoteStore:
+    """
+    SQLite-backed quotes (WAL, so the re-price pool can write while the
+    app reads).
+
+        quotes(q_number, q_int, customer, project, timestamp, settings, extra)
+        quote_rows(q_number, kind, line, data)
+        counters(name, value)
+
+    settings, extra (any other top-level keys) and each row are JSON
+    text. counters['q_number'] is the highest quote number ever saved.
+    """
+
+    def __init__(self, path=QUOTES_DB):
+        self.path = path
+
+        folder = os.path.dirname(path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+
+        with self._connect() as con:
+            con.execute("PRAGMA journal_mode=WAL")
+            con.executescript("""
+                CREATE TABLE IF NOT EXISTS quotes (
+                    q_number TEXT PRIMARY KEY,
+                    q_int INTEGER,
+                    customer TEXT,
+                    project TEXT,
+                    timestamp TEXT,
+                    settings TEXT,
+                    extra TEXT
+                );
+                CREATE INDEX IF NOT EXISTS quotes_customer ON quotes (customer);
+                CREATE INDEX IF NOT EXISTS quotes_project ON quotes (project);
+                CREATE INDEX IF NOT EXISTS quotes_timestamp ON quotes (timestamp);
+                CREATE TABLE IF NOT EXISTS quote_rows (
+                    q_number TEXT NOT NULL
+                        REFERENCES quotes (q_number) ON DELETE CASCADE,
+                    kind TEXT NOT NULL,
+                    line INTEGER NOT NULL,
+                    data TEXT NOT NULL,
+                    PRIMARY KEY (q_number, kind, line)
+                );
+                CREATE TABLE IF NOT EXISTS counters (
+                    name TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL
+                );
+            """)
+
+    @contextmanager
+    def _connect(self):
+        """One transaction on a fresh connection: commit (or roll back), then close."""
+        con = sqlite3.connect(self.path, timeout=30)
+        try:
+            con.execute("PRAGMA foreign_keys = ON")
+            with con:
+                yield con
+        finally:
+            con.close()
+
+    def is_empty(self):
+        with self._connect() as con:
+            return con.execute("SELECT 1 FROM quotes LIMIT 1").fetchone() is None
+
+    # --------------------------------------------------------
+    # READS
+    # --------------------------------------------------------
+    def q_numbers(self):
+        with self._connect() as con:
+            rows = con.execute("SELECT q_number FROM quotes ORDER BY q_number").fetchall()
+        return [r[0] for r in rows]
+
+    def next_q_number(self):
+        with self._connect() as con:
+            row = con.execute("SELECT value FROM counters WHERE name = 'q_number'").fetchone()
+        return format_q_number((row[0] if row else 0) + 1)
+
+    def headers(self, customer=None, project=None):
+        """Header dicts, newest first, optionally filtered (indexed lookups)."""
+        sql = "SELECT q_number, customer, project, timestamp FROM quotes"
+        where, args = [], []
+        if customer is not None:
+            where.append("customer = ?")
+            args.append(customer)
+        if project is not None:
+            where.append("project = ?")
+            args.append(project)
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY timestamp DESC"
+
+        with self._connect() as con:
+            rows = con.execute(sql, args).fetchall()
+        return [dict(zip(HEADER_FIELDS, r)) for r in rows]
+
+    def load(self, qnum):
+        with self._connect() as con:
+            head = con.execute(
+                "SELECT q_number, customer, project, timestamp, settings, extra "
+                "FROM quotes WHERE q_number = ?",
+                (qnum,),
+            ).fetchone()
+            if head is None:
+                return None
+            rows = con.execute(
+                "SELECT kind, data FROM quote_rows WHERE q_number = ? ORDER BY kind, line",
+                (qnum,),
+            ).fetchall()
+
+        data = dict(zip(HEADER_FIELDS, head[:4]))
+        for kind in ROW_KINDS:
+            data[kind] = []
+        for kind, row in rows:
+            data.setdefault(kind, []).append(json.loads(row))
+        data["settings"] = json.loads(head[4]) if head[4] else {}
+        data.update(json.loads(head[5]) if head[5] else {})
+        return data
+
+    # --------------------------------------------------------
+    # WRITES
+    # --------------------------------------------------------
+    def _write(self, con, data):
+        qnum = data["q_number"]
+        q_int = q_number_int(qnum)
+        extra = {
+            k: v for k, v in data.items()
+            if k not in HEADER_FIELDS and k not in ROW_KINDS and k != "settings"
+        }
+
+        con.execute(
+            "INSERT OR REPLACE INTO quotes "
+            "(q_number, q_int, customer, project, timestamp, settings, extra) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                qnum, q_int, data.get("customer"), data.get("project"), data.get("timestamp"),
+                json.dumps(data.get("settings", {})), json.dumps(extra),
+            ),
+        )
+        con.execute("DELETE FROM quote_rows WHERE q_number = ?", (qnum,))
+        con.executemany(
+            "INSERT INTO quote_rows (q_number, kind, line, data) VALUES (?, ?, ?, ?)",
+            [
+                (qnum, kind, i, json.dumps(row))
+                for kind in ROW_KINDS
+                for i, row in enumerate(data.get(kind) or [])
+            ],
+        )
+
+        if q_int is not None:
+            con.execute(
+                "INSERT INTO counters (name, value) VALUES ('q_number', ?) "
+                "ON CONFLICT (name) DO UPDATE SET value = MAX(value, excluded.value)",
+                (q_int,),
+            )
+
+    def save(self, data):
+        with self._connect() as con:
+            self._write(con, data)
+
+    def save_many(self, quotes):
+        """Write many quote dicts in one transaction."""
+        with self._connect() as con:
+            for data in quotes:
+                self._write(con, data)
+
+    def update(self, qnum, fields):
+        with self._connect() as con:
+            head = con.execute(
+                "SELECT extra FROM quotes WHERE q_number = ?", (qnum,)
+            ).fetchone()
+            if head is None:
+                return False
+
+            extra = json.loads(head[0]) if head[0] else {}
+            for key, value in fields.items():
+                if key in ROW_KINDS:
+                    con.execute(
+                        "DELETE FROM quote_rows WHERE q_number = ? AND kind = ?", (qnum, key)
+                    )
+                    con.executemany(
+                        "INSERT INTO quote_rows (q_number, kind, line, data) VALUES (?, ?, ?, ?)",
+                        [(qnum, key, i, json.dumps(row)) for i, row in enumerate(value or [])],
+                    )
+                elif key in ("customer", "project", "timestamp"):
+                    con.execute(f"UPDATE quotes SET {key} = ? WHERE q_number = ?", (value, qnum))
+                elif key == "settings":
+                    con.execute(
+                        "UPDATE quotes SET settings = ? WHERE q_number = ?",
+                        (json.dumps(value), qnum),
+                    )
+                elif key != "q_number":
+                    extra[key] = value
+
+            con.execute(
+                "UPDATE quotes SET extra = ? WHERE q_number = ?", (json.dumps(extra), qnum)
+            )
+        return True
+
+    def delete(self, qnum):
+        with self._connect() as con:
+            cur = con.execute("DELETE FROM quotes WHERE q_number = ?", (qnum,))
+        return cur.rowcount > 0
+
+
+# ============================================================
+# MIGRATION
+# ============================================================
+
+def migrate_json_quotes(folder=QUOTES_DIR, store=None):
+    """
+    Copy every <q_number>.json in folder into a SQLite store (one
+    transaction). Safe to re-run: quotes already there are overwritten.
+
+    Returns (number migrated, errors list)
+    """
+    store = store or SqliteQuoteStore()
+    if not os.path.isdir(folder):
+        return 0, []
+
+    quotes, errors = [], []
+    for name in sorted(os.listdir(folder)):
+        if not name.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(folder, name), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            data.setdefault("q_number", name[:-len(".json")])
+            quotes.append(data)
+        except Exception as e:
+            errors.append(f"{name}: {e}")
+
+    store.save_many(quotes)
+    return len(quotes), errors
+
+
+# ============================================================
+# PROCESS-WIDE STORE
+# ============================================================
+
+_STORES = {}
+
+
+def get_quote_store(backend=None):
+    """
+    The store for this process, chosen by backend or $QUOTE_STORE.
+
+    A brand-new SQLite store picks up the JSON quotes already on disk.
+    """
+    backend = (backend or os.environ.get("QUOTE_STORE") or "sqlite").lower()
+    if backend not in _STORES:
+        if backend == "json":
+            _STORES[backend] = JsonQuoteStore(QUOTES_DIR)
+        elif backend == "sqlite":
+            fresh = not os.path.exists(QUOTES_DB)
+            store = SqliteQuoteStore(QUOTES_DB)
+            if fresh and store.is_empty():
+                migrate_json_quotes(QUOTES_DIR, store)
+            _STORES[backend] = store
+        else:
+            raise ValueError(f"Unknown quote store: {backend!r}")
+    return _STORES[backend]
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] != "migrate":
+        print("usage: python -m core.quote_store migrate [quotes_dir] [db_path]")
+        sys.exit(2)
+
+    src = sys.argv[2] if len(sys.argv) > 2 else QUOTES_DIR
+    dst = sys.argv[3] if len(sys.argv) > 3 else QUOTES_DB
+
+    n, errs = migrate_json_quotes(src, SqliteQuoteStore(dst))
+    print(f"Migrated {n} quote(s) from {src} into {dst}")
+    for e in errs:
+        print("  skipped", e)
+    sys.exit(1 if errs else 0)
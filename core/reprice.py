@@ -0,0 +1,191 @@
+"""
+Bulk re-price of saved quotes against the current price book.
+
+    python -m core.reprice [--settings snapshot.json] [--workers N] [--force]
+
+Each quote's raw_rows are priced with price_lines and written back as
+recalculated_rows. Quotes already re-priced against an identical
+settings snapshot (same hash) are skipped.
+"""
+import argparse
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from core.pricing import price_lines, COST_COLUMNS, PRICE_SETTINGS
+from core.save_load import (
+    load_quote,
+    update_quote,
+    make_json_safe,
+    quote_rows_frame,
+    get_existing_q_numbers
+)
+from core.settings import get_default_settings, settings_from_snapshot
+
+# Below this many quotes a pool costs more than it saves
+MIN_POOL_QUOTES = 8
+
+
+# ============================================================
+# SETTINGS HASH
+# ============================================================
+def settings_hash(settings):
+    """
+    Stable hash of the price-bearing settings (DataFrames included).
+
+    Only PRICE_SETTINGS count: kerf, optimiser knobs and version
+    counters don't change a price, so they don't force a re-price.
+    """
+    priced = {k: settings.get(k) for k in PRICE_SETTINGS}
+    blob = json.dumps(make_json_safe(priced), sort_keys=True, default=str)
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()
+
+
+# ============================================================
+# SINGLE QUOTE
+# ============================================================
+def reprice_rows(raw_rows, settings):
+    """
+    Re-price quote rows. POA lines keep their quoted per-leaf price.
+
+    Returns (recalculated rows DataFrame, poa line count)
+    """
+    lines = quote_rows_frame({"raw_rows": raw_rows})
+    if lines.empty:
+        return lines, 0
+
+    costs, poa = price_lines(lines, settings)
+
+    if poa.any() and "Leaf Cost" in lines.columns:
+        leaves = np.where(lines["Form"] == "Double", 2, 1)
+        lines["Leaf Price"] = np.where(poa, lines["Leaf Cost"] / leaves, np.nan)
+        costs, poa = price_lines(lines, settings)
+
+    out = lines.drop(columns=["Leaf Price"], errors="ignore").copy()
+    out[COST_COLUMNS] = costs[COST_COLUMNS]
+
+    # Keep each line's quoted markup
+    if "Sell" in lines.columns:
+        ratio = (lines["Sell"] / lines["Total Cost"]).replace([np.inf, -np.inf], np.nan)
+        out["Sell"] = out["Total Cost"] * ratio.fillna(1)
+        out["Margin %"] = (out["Sell"] - out["Total Cost"]) / out["Sell"] * 100
+
+    return out, int(poa.sum())
+
+
+def reprice_quote(qnum, settings, current_hash, force=False, write=True):
+    """Worker: re-price one saved quote and return its report row."""
+    report = {"Quote": qnum, "Status": "", "Customer": "", "Project": ""}
+
+    try:
+        data = load_quote(qnum)
+        if data is None:
+            report["Status"] = "missing"
+            return report
+
+        report["Customer"] = data.get("customer", "")
+        report["Project"] = data.get("project", "")
+
+        if not force and data.get("recalc_settings_hash") == current_hash:
+            report["Status"] = "unchanged"
+            return report
+
+        raw = pd.DataFrame(data.get("raw_rows", []))
+        new, poa_lines = reprice_rows(data.get("raw_rows", []), settings)
+
+        old_cost = float(raw["Total Cost"].sum()) if "Total Cost" in raw else 0.0
+        new_cost = float(new["Total Cost"].sum()) if "Total Cost" in new else 0.0
+        old_sell = float(raw["Sell"].sum()) if "Sell" in raw else old_cost
+        new_sell = float(new["Sell"].sum()) if "Sell" in new else new_cost
+
+        report.update({
+            "Status": "repriced",
+            "Lines": len(new),
+            "POA Lines": poa_lines,
+            "Old Cost": old_cost,
+            "New Cost": new_cost,
+            "Cost Δ": new_cost - old_cost,
+            "Old Sell": old_sell,
+            "New Sell": new_sell,
+            "Sell Δ": new_sell - old_sell,
+        })
+
+        if write:
+            update_quote(qnum, {
+                "recalculated_rows": new.to_dict(orient="records"),
+                "recalc_settings_hash": current_hash,
+                "recalc_timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            })
+
+    except Exception as e:
+        report["Status"] = f"error: {e}"
+
+    return report
+
+
+# ============================================================
+# ALL QUOTES
+# ============================================================
+def reprice_all_quotes(settings, qnums=None, workers=None, force=False, write=True):
+    """
+    Re-price every saved quote across a process pool (one worker per core).
+    Returns a report DataFrame, one row per quote.
+    """
+    if qnums is None:
+        qnums = get_existing_q_numbers()
+
+    current_hash = settings_hash(settings)
+    args = [(q, settings, current_hash, force, write) for q in qnums]
+
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(qnums) < MIN_POOL_QUOTES:
+        reports = [reprice_quote(*a) for a in args]
+    else:
+        chunk = max(1, len(args) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            reports = list(pool.map(_reprice_args, args, chunksize=chunk))
+
+    return pd.DataFrame(reports)
+
+
+def _reprice_args(args):
+    return reprice_quote(*args)
+
+
+# ============================================================
+# CLI
+# ============================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-price all saved quotes.")
+    parser.add_argument("--settings", help="JSON settings snapshot (default: built-in price book)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--force", action="store_true", help="Re-price even if settings are unchanged")
+    parser.add_argument("--dry-run", action="store_true", help="Report deltas without writing quotes")
+    args = parser.parse_args(argv)
+
+    if args.settings:
+        with open(args.settings, "r", encoding="utf-8") as f:
+            snap = json.load(f)
+        settings = settings_from_snapshot(snap.get("settings", snap))
+    else:
+        settings = get_default_settings()
+
+    report = reprice_all_quotes(
+        settings,
+        workers=args.workers,
+        force=args.force,
+        write=not args.dry_run,
+    )
+
+    with pd.option_context("display.max_rows", None, "display.width", 200):
+        print(report.to_string(index=False) if not report.empty else "No quotes found.")
+
+
+if __name__ == "__main__":
+    main()
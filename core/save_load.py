@@ -1,10 +1,9 @@
 import os
-import json
 from datetime import datetime
 import pandas as pd
 import numpy as np
 
-QUOTES_DIR = "quotes"
+from core.quote_store import QUOTES_DIR, get_quote_store
 
 
 # ============================================================
@@ -17,11 +16,13 @@ def ensure_quotes_dir():
 
 
 def get_existing_q_numbers():
-    """Return list of all saved quote filenames without extension."""
-    ensure_quotes_dir()
-    files = [f for f in os.listdir(QUOTES_DIR) if f.endswith(".json")]
-    qnums = [f.replace(".json", "") for f in files]
-    return sorted(qnums)
+    """Return sorted list of all saved quote numbers."""
+    return get_quote_store().q_numbers()
+
+
+def list_quotes(customer=None, project=None):
+    """Saved quote headers (q_number, customer, project, timestamp), newest first."""
+    return get_quote_store().headers(customer=customer, project=project)
 
 
 # ============================================================
@@ -29,23 +30,7 @@ def get_existing_q_numbers():
 # ============================================================
 def suggest_next_q():
     """Suggest next quote number: Q0001, Q0002, etc."""
-    qnums = get_existing_q_numbers()
-
-    if not qnums:
-        return "Q0001"
-
-    nums = []
-    for q in qnums:
-        try:
-            nums.append(int(q.replace("Q", "").strip()))
-        except:
-            pass
-
-    if not nums:
-        return "Q0001"
-
-    next_num = max(nums) + 1
-    return f"Q{next_num:04d}"
+    return get_quote_store().next_q_number()
 
 
 # ============================================================
@@ -94,8 +79,6 @@ def save_quote(qnum, customer, project, raw_rows, recalculated_rows, settings):
     - recalculated rows
     - settings snapshot
     """
-    ensure_quotes_dir()
-
     data = {
         "q_number": qnum,
         "customer": customer,
@@ -106,38 +89,42 @@ def save_quote(qnum, customer, project, raw_rows, recalculated_rows, settings):
         "settings": make_json_safe(settings)
     }
 
-    path = os.path.join(QUOTES_DIR, f"{qnum}.json")
-
-    # Write JSON
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4)
+    get_quote_store().save(data)
 
     return True
-import os
+
 
 def delete_quote(qnum):
     """
-    Deletes a saved quote JSON file.
+    Deletes a saved quote.
     Returns True if deleted, False if not found.
     """
-    path = os.path.join("quotes", f"{qnum}.json")
-    if os.path.exists(path):
-        os.remove(path)
-        return True
-    return False
+    return get_quote_store().delete(qnum)
 
 
 
+# ============================================================
+# UPDATE QUOTE FIELDS
+# ============================================================
+def update_quote(qnum, fields):
+    """Merge fields into an existing saved quote. Returns False if missing."""
+    return get_quote_store().update(qnum, make_json_safe(fields))
+
+
+# ============================================================
+# QUOTE ROWS -> DATAFRAME
+# ============================================================
+def quote_rows_frame(data, key="raw_rows"):
+    """Saved quote rows as a DataFrame. Older quotes used 'Leaf'."""
+    df = pd.DataFrame(data.get(key, []))
+    if "Leaf Type" not in df.columns and "Leaf" in df.columns:
+        df["Leaf Type"] = df["Leaf"]
+    return df
+
+
 # ============================================================
 # LOAD QUOTE
 # ============================================================
 def load_quote(qnum):
     """Load a saved quote safely and return dict."""
-    ensure_quotes_dir()
-    path = os.path.join(QUOTES_DIR, f"{qnum}.json")
-
-    if not os.path.exists(path):
-        return None
-
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return get_quote_store().load(qnum)
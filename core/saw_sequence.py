@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+
+SEQUENCE_COLUMNS = ["Step", "Stop (mm)", "Stock #", "Stock Length (mm)", "Qty"]
+
+
+# ============================================================
+# STOP CHANGES
+# ============================================================
+
+def stop_changes(cut_lengths):
+    """Length-stop settings needed to make cuts in this order (first set-up counts)."""
+    cuts = np.asarray(cut_lengths, dtype=np.int64)
+    if len(cuts) == 0:
+        return 0
+    return int(1 + np.count_nonzero(cuts[1:] != cuts[:-1]))
+
+
+def cut_list_order(plan):
+    """Cuts in the order the cut list reads: length by length, longest cut first."""
+    order = np.argsort(plan["bundle"], kind="stable")
+    return plan["piece"][order], plan["bundle"][order]
+
+
+# ============================================================
+# SEQUENCE
+# ============================================================
+
+def saw_sequence(plan):
+    """
+    Station-ready order for one profile's cut list.
+
+    Every cut of one length is made in one go across all stock lengths
+    that need it, so the stop is set once per distinct length (the
+    fewest possible). Distinct lengths run longest to shortest, which is
+    the nearest-neighbour walk from the longest setting along a straight
+    fence, i.e. the least stop travel.
+
+    Returns (sequence DataFrame, report dict with before/after counts)
+    """
+    pieces, bundles = cut_list_order(plan)
+    before = stop_changes(pieces)
+
+    if len(pieces) == 0:
+        return pd.DataFrame(columns=SEQUENCE_COLUMNS), {"cuts": 0, "before": 0, "after": 0}
+
+    # (length desc, stock # asc) -> qty, all in one sort
+    order = np.lexsort((bundles, -pieces))
+    p, b = pieces[order], bundles[order]
+    new = np.ones(len(p), dtype=bool)
+    new[1:] = (p[1:] != p[:-1]) | (b[1:] != b[:-1])
+    starts = np.flatnonzero(new)
+    qty = np.diff(np.append(starts, len(p)))
+
+    stop = p[starts]
+    stock_no = b[starts]
+    step = np.cumsum(np.r_[True, stop[1:] != stop[:-1]])
+
+    seq = pd.DataFrame({
+        "Step": step,
+        "Stop (mm)": stop,
+        "Stock #": stock_no + 1,
+        "Stock Length (mm)": plan["stock"][stock_no],
+        "Qty": qty,
+    }, columns=SEQUENCE_COLUMNS)
+
+    if "offcut" in plan:
+        seq["Source"] = np.where(
+            plan["offcut"][stock_no] >= 0,
+            np.char.add("Offcut #", plan["offcut"][stock_no].astype(str)),
+            "New",
+        )
+
+    after = int(step[-1])
+    return seq, {"cuts": int(len(pieces)), "before": before, "after": after}
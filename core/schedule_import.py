@@ -0,0 +1,198 @@
+import re
+import numpy as np
+import pandas as pd
+
+from core.pricing import price_lines, COST_COLUMNS
+from core.sku import create_sku, lookup_descriptions
+
+# ============================================================
+# COLUMN ALIASES (builder schedules are never consistent)
+# ============================================================
+
+COLUMN_ALIASES = {
+    "Leaf Type": ["leaf type", "leaf", "material", "core", "door type"],
+    "Thickness": ["thickness", "leaf thickness", "thk"],
+    "Height": ["height", "leaf height", "door height"],
+    "Width": ["width", "leaf width", "door width"],
+    "Jamb Type": ["jamb type", "jamb", "frame", "jamb profile"],
+    "Form": ["form", "single / double", "single/double", "config"],
+    "Qty": ["qty", "quantity", "sets", "count"],
+}
+
+REQUIRED = ["Leaf Type", "Thickness", "Height", "Width", "Jamb Type", "Form"]
+
+# Shorter text is too vague to match as part of an option name
+MIN_SUBSTRING_MATCH = 3
+
+
+def _norm(text):
+    return re.sub(r"\s+", " ", str(text).strip().lower())
+
+
+def read_schedule(file):
+    """Read a CSV or XLSX schedule (path or uploaded file)."""
+    name = str(getattr(file, "name", file)).lower()
+    if name.endswith(".csv"):
+        return pd.read_csv(file)
+    return pd.read_excel(file)
+
+
+def map_schedule_columns(raw):
+    """Rename schedule columns to the estimator's names."""
+    lookup = {}
+    for target, aliases in COLUMN_ALIASES.items():
+        for a in [target.lower()] + aliases:
+            lookup.setdefault(a, target)
+
+    renames = {}
+    for c in raw.columns:
+        target = lookup.get(_norm(c))
+        if target and target not in renames.values():
+            renames[c] = target
+
+    df = raw.rename(columns=renames)
+
+    missing = [c for c in REQUIRED if c not in df.columns]
+    if missing:
+        raise ValueError(f"Missing column(s) in schedule: {', '.join(missing)}")
+
+    if "Qty" not in df.columns:
+        df["Qty"] = 1
+
+    return df[REQUIRED + ["Qty"]]
+
+
+# ============================================================
+# VALUE NORMALISATION
+# ============================================================
+
+def _match_choice(values, choices):
+    """
+    Map free text onto a known option: exact (case-insensitive),
+    then by leading code (e.g. 'US14'), then by size (e.g. '92x18'),
+    then as part of an option name. Blank text matches nothing.
+    """
+    exact = {_norm(c): c for c in choices}
+    by_code = {_norm(c).split()[0]: c for c in choices}
+    by_size = {}
+    for c in choices:
+        m = re.search(r"\d+x\d+", _norm(c))
+        if m:
+            by_size[m.group(0)] = c
+
+    def one(v):
+        if pd.isna(v):
+            return None
+        t = _norm(v)
+        if not t:
+            return None
+        if t in exact:
+            return exact[t]
+        if t.split() and t.split()[0] in by_code:
+            return by_code[t.split()[0]]
+        m = re.search(r"\d+\s*x\s*\d+", t)
+        if m:
+            return by_size.get(m.group(0).replace(" ", ""))
+        if len(t) >= MIN_SUBSTRING_MATCH:
+            for k, c in exact.items():
+                if t in k:
+                    return c
+        return None
+
+    # Schedules repeat the same few strings, so map each distinct value once
+    uniq = pd.unique(values)
+    mapping = {u: one(u) for u in uniq}
+    return values.map(mapping)
+
+
+def _norm_form(v):
+    t = _norm(v)
+    if t in ("double", "d", "pr", "pair", "2"):
+        return "Double"
+    if t in ("single", "s", "1"):
+        return "Single"
+    return None
+
+
+def _norm_thickness(v):
+    m = re.search(r"\d+", str(v))
+    return f"{m.group(0)}mm" if m else None
+
+
+def normalise_schedule(df, settings):
+    """
+    Returns:
+        clean   rows ready for pricing
+        errors  rows that could not be mapped, with a 'Problem' column
+    """
+    df = df.copy()
+    df["Schedule Row"] = np.arange(len(df)) + 1
+
+    df["Leaf Type"] = _match_choice(df["Leaf Type"], list(settings["prefix_map"].keys()))
+    df["Jamb Type"] = _match_choice(df["Jamb Type"], list(settings["frame_prices"].keys()))
+    df["Form"] = df["Form"].map(_norm_form)
+    df["Thickness"] = df["Thickness"].map(_norm_thickness)
+
+    for c in ["Height", "Width", "Qty"]:
+        df[c] = pd.to_numeric(df[c], errors="coerce")
+    df["Qty"] = df["Qty"].fillna(1)
+
+    problem = pd.Series("", index=df.index)
+    for c in REQUIRED + ["Qty"]:
+        problem = problem.where(df[c].notna(), problem + f"bad {c}; ")
+    problem = problem.where(df["Qty"].fillna(0) >= 1, problem + "bad Qty; ")
+
+    # Heights, widths and set counts are whole numbers; don't truncate 1.5
+    for c in ["Height", "Width", "Qty"]:
+        fractional = df[c].notna() & (df[c] % 1 != 0)
+        problem = problem.where(~fractional, problem + f"{c} not a whole number; ")
+
+    bad = problem != ""
+    errors = df[bad].assign(Problem=problem[bad].str.rstrip("; "))
+    clean = df[~bad].copy()
+
+    for c in ["Height", "Width", "Qty"]:
+        clean[c] = clean[c].astype(int)
+
+    return clean.reset_index(drop=True), errors.reset_index(drop=True)
+
+
+# ============================================================
+# BUILD QUOTE ROWS
+# ============================================================
+
+def build_schedule_rows(clean, settings, hinge_df, customer="", project=""):
+    """
+    SKU + description + one batch pricing pass for every line.
+
+    Returns:
+        rows    DataFrame in the estimator's row layout (priced lines)
+        poa     DataFrame of lines with no leaf price
+    """
+    prefix = clean["Leaf Type"].map(settings["prefix_map"])
+
+    skus = [
+        create_sku(p, t, h, w, j, f)
+        for p, t, h, w, j, f in zip(
+            prefix, clean["Thickness"], clean["Height"],
+            clean["Width"], clean["Jamb Type"], clean["Form"]
+        )
+    ]
+
+    lines = clean.assign(
+        Customer=customer,
+        Project=project,
+        SKU=skus,
+        Description=lookup_descriptions(hinge_df, skus) if hinge_df is not None else "",
+    )
+
+    costs, poa_mask = price_lines(lines, settings)
+
+    cols = [
+        "Customer", "Project", "SKU", "Description",
+        "Leaf Type", "Form", "Thickness", "Height", "Width", "Qty", "Jamb Type",
+    ]
+    rows = pd.concat([lines[cols], costs[COST_COLUMNS]], axis=1)
+
+    poa = lines.loc[poa_mask, ["Schedule Row"] + cols[2:]]
+    return rows[~poa_mask].reset_index(drop=True), poa.reset_index(drop=True)
@@ -55,6 +55,9 @@ def get_default_settings():
             ], columns=["Height", "Width", "35mm", "38mm"]),
         },
 
+        # Bumped by the Settings tab whenever a leaf table is edited
+        "door_leaf_prices_version": 0,
+
         # ========================
         # FRAME + LABOUR SETTINGS
         # ========================
@@ -71,6 +74,14 @@ def get_default_settings():
         # Stop Price (NOT MINIMUM CHARGED)
         "stop_price": 0.83,
 
+        # ========================
+        # CUTTING (PRODUCTION)
+        # ========================
+        "saw_kerf_mm": 0,
+        "cut_time_budget_s": 0.25,  # optimiser time per profile (solved in parallel)
+        "stock_prices": {},         # optional {stock mm: price}, else min waste
+        "use_offcuts": True,        # cut from the offcut rack before new stock
+
         # ========================
         # FRAME PRICES (NO STOP HERE)
         # ========================
@@ -81,3 +92,19 @@ def get_default_settings():
             "DG1 136x30 Double Grooved": 7.68,
         },
     }
+
+
+def settings_from_snapshot(snapshot):
+    """
+    Rebuild a settings dict from a JSON snapshot (as saved with a quote).
+    Leaf tables come back as DataFrames; missing keys fall back to defaults.
+    """
+    settings = get_default_settings()
+    for key, value in snapshot.items():
+        if key == "door_leaf_prices":
+            settings[key] = {
+                leaf: pd.DataFrame(table) for leaf, table in value.items()
+            }
+        else:
+            settings[key] = value
+    return settings
@@ -1,4 +1,9 @@
 import re
+import numpy as np
+import pandas as pd
+
+NOT_FOUND = "DESCRIPTION NOT FOUND"
+
 
 def create_sku(prefix, thickness, height, width, jamb, form):
     m = re.search(r"(\d+)[xX](\d+)", jamb)
@@ -8,3 +13,47 @@ def create_sku(prefix, thickness, height, width, jamb, form):
 
     sku = f"{prefix}{thickness.replace('mm','')}{height}{width}{ph}"
     return sku + "-PR" if form == "Double" else sku
+
+
+# ---------------------------------------------
+# SKU -> Description index
+#   Built once per hinge sheet frame (the loader hands out
+#   the same frame until the xlsx changes).
+# ---------------------------------------------
+_INDEX_CACHE = {"df": None, "index": None}
+
+
+class SkuIndex:
+    def __init__(self, hinge_df):
+        # First row wins on duplicate codes, same as the old mask lookup
+        first = hinge_df.drop_duplicates(subset="Code", keep="first")
+        self.codes = pd.Index(first["Code"].astype(str))
+        self.descriptions = first["Description"].to_numpy(dtype=object)
+        self.by_code = dict(zip(self.codes, self.descriptions))
+
+    def describe(self, sku, default=NOT_FOUND):
+        return self.by_code.get(sku, default)
+
+    def describe_many(self, skus, default=NOT_FOUND):
+        """Resolve a list/array/Series of SKUs in one pass."""
+        pos = self.codes.get_indexer(pd.Index(skus, dtype=object))
+        out = np.full(len(pos), default, dtype=object)
+        hit = pos >= 0
+        out[hit] = self.descriptions[pos[hit]]
+        return out
+
+
+def sku_index(hinge_df):
+    if _INDEX_CACHE["df"] is not hinge_df:
+        _INDEX_CACHE["index"] = SkuIndex(hinge_df)
+        _INDEX_CACHE["df"] = hinge_df
+    return _INDEX_CACHE["index"]
+
+
+def lookup_description(hinge_df, sku):
+    return sku_index(hinge_df).describe(sku)
+
+
+def lookup_descriptions(hinge_df, skus):
+    """Bulk SKU -> Description; unknown codes get NOT_FOUND."""
+    return sku_index(hinge_df).describe_many(skus)
@@ -1,13 +1,159 @@
-def greedy_stock(total_m):
-    L54 = 5.4
-    L21 = 2.1
+from itertools import product
+from math import gcd, prod
+import numpy as np
 
-    if total_m <= 0:
-        return 0, 0, 0.0
+STRATEGY_STOCK_LENGTHS = {
+    "Only 5.4": [5400],
+    "Only 2.1": [2100],
+    "Mix": [2100, 5400],
+}
+
+# Above this many exchange combinations, solve by DP over mm instead
+MAX_EXCHANGE_COMBOS = 20000
+
+
+# ============================================================
+# STOCK MIX (integer mm, exact)
+# ============================================================
+
+def stock_mix(total_mm, stock_lengths, prices=None):
+    """
+    Cheapest count of each stock length covering each required total.
+
+    total_mm:       scalar or array of required mm (one per profile)
+    stock_lengths:  any stock lengths in mm
+    prices:         optional {stock mm: price}; default price = length,
+                    i.e. minimum waste
+
+    Exact: take the length with the best price per mm as the base.
+    Swapping base/g copies of any other length k (g = gcd) for k/g base
+    lengths never costs more, so an optimum uses fewer than base/g of
+    each other length. Every such combination is costed for every total
+    at once; the base count is then closed-form (ceil).
+
+    Lengths with a small gcd (e.g. 2099 / 3001 / 5400) would need up to
+    L^(k-1) combinations, so past MAX_EXCHANGE_COMBOS the same optimum
+    is found by a DP over every mm up to max(total) + longest stock.
+
+    Returns:
+        counts  int array (n_totals, n_stock_lengths), in stock_lengths order
+        waste   int array of waste mm per total
+    """
+    totals = np.atleast_1d(np.asarray(total_mm, dtype=np.int64))
+    lengths = np.asarray([int(s) for s in stock_lengths], dtype=np.int64)
+    price = np.asarray(
+        [float(prices.get(int(s), s)) if prices else float(s) for s in lengths]
+    )
+
+    # Base = best price per mm (longest on ties: fewer pieces)
+    base = int(np.lexsort((-lengths, price / lengths))[0])
+    others = [k for k in range(len(lengths)) if k != base]
+    L = int(lengths[base])
+
+    bounds = [range(L // gcd(L, int(lengths[k]))) for k in others]
+    if prod(len(b) for b in bounds) > MAX_EXCHANGE_COMBOS:
+        counts = _dp_mix(totals, lengths, price)
+        counts[totals <= 0] = 0
+        return counts, counts @ lengths - np.maximum(totals, 0)
+
+    combos = np.array(list(product(*bounds)), dtype=np.int64).reshape(-1, len(others)) \
+        if others else np.zeros((1, 0), dtype=np.int64)
+
+    combo_len = combos @ lengths[others]
+    combo_cost = combos @ price[others]
+
+    # (n_totals, n_combos): base lengths still needed after each combo
+    short = np.maximum(totals[:, None] - combo_len[None, :], 0)
+    n_base = -(-short // L)
+    cost = combo_cost[None, :] + n_base * price[base]
+    covered = combo_len[None, :] + n_base * L
+
+    # Cheapest, then least waste, then fewest pieces
+    pieces = combos.sum(axis=1)[None, :] + n_base
+    best = _argmin_lex(np.round(cost, 9), covered, pieces)
+
+    rows = np.arange(len(totals))
+    counts = np.zeros((len(totals), len(lengths)), dtype=np.int64)
+    counts[:, others] = combos[best]
+    counts[:, base] = n_base[rows, best]
 
-    n54 = int(total_m // L54)
-    rem = total_m - n54 * L54
-    n21 = int(rem // L21)
-    waste = rem - n21 * L21
+    # Nothing needed -> nothing bought
+    counts[totals <= 0] = 0
+    waste = counts @ lengths - np.maximum(totals, 0)
 
-    return n54, n21, waste
+    return counts, waste
+
+
+def _dp_mix(totals, lengths, price):
+    """
+    stock_mix by dynamic programming over integer mm.
+
+    cost[s] is the cheapest way to make exactly s mm (then fewest
+    pieces), built one length at a time, a block of `length` mm per step.
+    Each total then takes the best s in [total, total + longest stock),
+    a window that always holds a multiple of the longest stock.
+    """
+    longest = int(lengths.max())
+    top = int(max(totals.max(), 0)) + longest
+
+    cost = np.full(top + 1, np.inf)
+    cost[0] = 0.0
+    pieces = np.zeros(top + 1, dtype=np.int64)
+    last = np.full(top + 1, -1, dtype=np.int64)  # length index added last
+
+    for i, (l, p) in enumerate(zip(lengths.tolist(), price.tolist())):
+        for lo in range(l, top + 1, l):
+            hi = min(lo + l, top + 1)
+            c = cost[lo - l:hi - l] + p
+            n = pieces[lo - l:hi - l] + 1
+            c_r, old_r = np.round(c, 9), np.round(cost[lo:hi], 9)
+            better = (c_r < old_r) | ((c_r == old_r) & (n < pieces[lo:hi]))
+            cost[lo:hi] = np.where(better, c, cost[lo:hi])
+            pieces[lo:hi] = np.where(better, n, pieces[lo:hi])
+            last[lo:hi] = np.where(better, i, last[lo:hi])
+
+    # Cheapest, then least waste, then fewest pieces
+    window = np.maximum(totals, 0)[:, None] + np.arange(longest)[None, :]
+    best = _argmin_lex(np.round(cost[window], 9), window, pieces[window])
+
+    rows = np.arange(len(totals))
+    cur = window[rows, best]
+    counts = np.zeros((len(totals), len(lengths)), dtype=np.int64)
+    while (cur > 0).any():
+        act = np.flatnonzero(cur > 0)
+        used = last[cur[act]]
+        np.add.at(counts, (act, used), 1)
+        cur[act] -= lengths[used]
+    return counts
+
+
+def _argmin_lex(*keys):
+    """Row-wise argmin over several (n, m) keys, first key most significant."""
+    mask = np.ones(keys[0].shape, dtype=bool)
+    for k in keys:
+        masked = np.where(mask, k, np.inf)
+        mask &= masked == masked.min(axis=1, keepdims=True)
+    return mask.argmax(axis=1)
+
+
+def strategy_mix(total_m, strategy, prices=None):
+    """
+    Metres per profile + 'Only 5.4' / 'Only 2.1' / 'Mix' ->
+    (count_54, count_21, waste_m) arrays.
+    """
+    lengths = STRATEGY_STOCK_LENGTHS.get(strategy, STRATEGY_STOCK_LENGTHS["Mix"])
+    total_mm = np.rint(np.asarray(total_m, dtype=float) * 1000).astype(np.int64)
+
+    counts, waste = stock_mix(total_mm, lengths, prices)
+
+    by_len = dict(zip(lengths, counts.T))
+    zeros = np.zeros(len(waste), dtype=np.int64)
+    return by_len.get(5400, zeros), by_len.get(2100, zeros), waste / 1000
+
+
+def greedy_stock(total_m):
+    """Kept for callers: now the exact 5.4 + 2.1 minimum-waste mix."""
+    if total_m <= 0:
+        return 0, 0, 0.0
+    n54, n21, waste = strategy_mix(total_m, "Mix")
+    return int(n54[0]), int(n21[0]), float(waste[0])
@@ -1,8 +1,13 @@
 import openpyxl
 from openpyxl.cell.cell import MergedCell
 from openpyxl.styles import Alignment
+from openpyxl.utils.indexed_list import IndexedList
 from io import BytesIO
+import copy
 import datetime
+import math
+import os
+import threading
 
 # Column index constants
 COL_DOORNO = 1
@@ -20,9 +25,86 @@ COL_SINGLE = 12
 COL_DOUBLE = 13
 COL_SLIDE = 14
 
+# First door row of the table
+START_ROW = 14
+
+
+# ============================================================
+# TEMPLATE (parsed once per process)
+# ============================================================
+
+def merged_anchor_map(ws):
+    """{cell coordinate: top-left anchor} for every non-anchor cell in a merged range."""
+    anchors = {}
+    for merged_range in ws.merged_cells.ranges:
+        anchor = merged_range.start_cell.coordinate
+        for row in merged_range.cells:
+            r, c = row
+            coord = ws.cell(r, c).coordinate
+            if coord != anchor:
+                anchors[coord] = anchor
+    return anchors
+
+
+def table_capacity(ws, start_row=START_ROW):
+    """Door rows between the table header and the first merged block below it (the notes)."""
+    below = [
+        m.min_row for m in ws.merged_cells.ranges
+        if m.min_row >= start_row and m.min_col == COL_DOORNO
+    ]
+    end = min(below) if below else ws.max_row + 1
+    return max(end - start_row, 1)
+
+
+class OrderFormTemplate:
+    """A parsed order-form template, cloned in memory for each export."""
+
+    def __init__(self, path):
+        self.path = path
+        self.workbook = openpyxl.load_workbook(path)
+        ws = self.workbook.active
+        self.anchors = merged_anchor_map(ws)
+        self.capacity = table_capacity(ws)
+
+    def clone(self):
+        """
+        Independent copy of the parsed workbook. deepcopy leaves openpyxl's
+        IndexedList style tables empty (their lookup dict is restored first,
+        so append() skips every item), so those are rebuilt from the
+        originals; the style objects themselves are immutable and shared.
+        """
+        wb = copy.deepcopy(self.workbook)
+        for name, value in vars(self.workbook).items():
+            if isinstance(value, IndexedList):
+                setattr(wb, name, IndexedList(value))
+        return wb
+
+
+_TEMPLATES = {}
+_TEMPLATES_LOCK = threading.Lock()
+
+
+def load_order_template(template_path):
+    """Parse a template once; re-parse only if the file changes."""
+    path = os.path.abspath(template_path)
+    mtime = os.stat(path).st_mtime_ns
+    with _TEMPLATES_LOCK:
+        hit = _TEMPLATES.get(path)
+        if hit is None or hit[0] != mtime:
+            hit = (mtime, OrderFormTemplate(path))
+            _TEMPLATES[path] = hit
+        return hit[1]
+
+
+def safe_write(ws, cell_addr, value, anchors=None):
+    """
+    Write to a cell, redirecting to the anchor if the cell is part of a
+    merged range. anchors (merged_anchor_map) makes that a dict lookup.
+    """
+    if anchors is not None:
+        ws[anchors.get(cell_addr, cell_addr)].value = value
+        return
 
-def safe_write(ws, cell_addr, value):
-    """Write to a cell, redirecting to the anchor if the cell is part of a merged range."""
     cell = ws[cell_addr]
 
     if isinstance(cell, MergedCell):
@@ -35,37 +117,94 @@ def safe_write(ws, cell_addr, value):
         cell.value = value
 
 
+def copy_images(source, target):
+    """
+    copy_worksheet leaves images behind; give target its own copy of
+    each (own data stream too, as saving closes the one it reads).
+    """
+    for img in source._images:
+        dup = copy.copy(img)
+        dup.ref = copy.deepcopy(img.ref)
+        dup.anchor = copy.deepcopy(img.anchor)
+        target.add_image(dup)
+
+
 def tick(cell):
     cell.value = "✓"
     cell.alignment = Alignment(horizontal="center", vertical="center")
 
 
 def generate_order_form(template_path, job_details, contractor_details, door_rows):
-
-    wb = openpyxl.load_workbook(template_path)
+    """
+    Fill the order form. Doors beyond the template's table spill onto
+    copies of the sheet ("UNIT 1 (2)", ...), each with the same header
+    and logo. The template's sample doors are cleared from every page.
+    """
+    template = load_order_template(template_path)
+    wb = template.clone()
     ws = wb.active
 
+    # Copy blank pages before anything is written on the first one
+    pages = max(1, math.ceil(len(door_rows) / template.capacity))
+    sheets = [ws]
+    for p in range(2, pages + 1):
+        extra = wb.copy_worksheet(ws)
+        extra.title = f"{ws.title[:25]} ({p})"
+        copy_images(ws, extra)
+        sheets.append(extra)
+
+    for p, sheet in enumerate(sheets):
+        lo = p * template.capacity
+        write_header(sheet, job_details, contractor_details, template.anchors)
+        write_doors(sheet, door_rows[lo:lo + template.capacity], capacity=template.capacity)
+
+    # ==========================================
+    # RETURN BINARY CONTENTS
+    # ==========================================
+
+    bio = BytesIO()
+    wb.save(bio)
+    bio.seek(0)
+    return bio.getvalue()
+
+
+def write_header(ws, job_details, contractor_details, anchors=None):
+
     # ==========================================
     # SAFE HEADER FIELD WRITES
     # ==========================================
 
-    safe_write(ws, "C4", job_details.get("quote", ""))
-    safe_write(ws, "C5", job_details.get("project", ""))
-    safe_write(ws, "C6", job_details.get("address", ""))
+    safe_write(ws, "C4", job_details.get("quote", ""), anchors)
+    safe_write(ws, "C5", job_details.get("project", ""), anchors)
+    safe_write(ws, "C6", job_details.get("address", ""), anchors)
+
+    safe_write(ws, "H4", contractor_details.get("contractor", ""), anchors)
+    safe_write(ws, "H5", contractor_details.get("contact", ""), anchors)
+    safe_write(ws, "H6", contractor_details.get("phone", ""), anchors)
+    safe_write(ws, "H7", contractor_details.get("email", ""), anchors)
+    safe_write(ws, "H8", contractor_details.get("onsite", ""), anchors)
 
-    safe_write(ws, "H4", contractor_details.get("contractor", ""))
-    safe_write(ws, "H5", contractor_details.get("contact", ""))
-    safe_write(ws, "H6", contractor_details.get("phone", ""))
-    safe_write(ws, "H7", contractor_details.get("email", ""))
-    safe_write(ws, "H8", contractor_details.get("onsite", ""))
+    safe_write(ws, "H9", datetime.date.today().strftime("%d/%m/%Y"), anchors)
 
-    safe_write(ws, "H9", datetime.date.today().strftime("%d/%m/%Y"))
+
+def write_doors(ws, door_rows, start_row=START_ROW, capacity=None):
 
     # ==========================================
-    # WRITE DOOR TABLE
+    # CLEAR THE TABLE (the template ships sample doors)
     # ==========================================
 
-    start_row = 14
+    if capacity is None:
+        capacity = table_capacity(ws, start_row)
+
+    for row in ws.iter_rows(min_row=start_row, max_row=start_row + capacity - 1,
+                            min_col=COL_DOORNO, max_col=COL_SLIDE):
+        for cell in row:
+            if not isinstance(cell, MergedCell):
+                cell.value = None
+
+    # ==========================================
+    # WRITE DOOR TABLE
+    # ==========================================
 
     for i, d in enumerate(door_rows):
         r = start_row + i
@@ -96,12 +235,3 @@ def generate_order_form(template_path, job_details, contractor_details, door_row
             tick(ws.cell(r, COL_SINGLE))
         elif form == "double":
             tick(ws.cell(r, COL_DOUBLE))
-
-    # ==========================================
-    # RETURN BINARY CONTENTS
-    # ==========================================
-
-    bio = BytesIO()
-    wb.save(bio)
-    bio.seek(0)
-    return bio.getvalue()
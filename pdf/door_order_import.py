@@ -1,4 +1,11 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
+
 import openpyxl
+import pandas as pd
+
+from pdf.door_order_export import START_ROW
 
 
 COL_DOORNO = 1
@@ -16,53 +23,154 @@ COL_SINGLE = 12
 COL_DOUBLE = 13
 COL_SLIDE = 14
 
+# What counts as ticked. Not the Wingdings 2 "P" tick: the sample rows in
+# the shipped template carry those, and exports written over it keep them
+TICKS = frozenset({"✓", "✔", "☑"})
+
+# First ticked column wins, in this order
+JAMB_TICKS = [
+    (COL_92, "US14 92x18 Undershot"),
+    (COL_112, "US13 112x18 Undershot"),
+    (COL_136, "DG1 136x30 Double Grooved"),
+]
+FORM_TICKS = [
+    (COL_SINGLE, "Single"),
+    (COL_DOUBLE, "Double"),
+]
+
+ORDER_FORM_COLUMNS = ["Door #", "Room", "Handing", "UnderCut", "LeafWidth", "LeafHeight", "JambType", "Form"]
+
+# Below this many forms a pool costs more than it saves
+MIN_POOL_FORMS = 4
+
+# Table header cells that mark a sheet as an order form: (row, col) -> text
+FORM_HEADER = {
+    (START_ROW - 2, COL_DOORNO): "door no.",
+    (START_ROW - 1, COL_92): "92x18",
+    (START_ROW - 1, COL_112): "112x18",
+    (START_ROW - 1, COL_136): "136x30",
+    (START_ROW - 1, COL_SINGLE): "single",
+    (START_ROW - 1, COL_DOUBLE): "double",
+}
+
+# First cell of the notes block under the door table
+NOTES_LABEL = "note"
+
+
+def _ticked(row, choices):
+    """First choice whose column holds a tick, else ''."""
+    for col, value in choices:
+        v = row[col - 1]
+        if v is not None and str(v).strip() in TICKS:
+            return value
+    return ""
+
+
+def _cell_text(v):
+    return "" if v is None else str(v).strip().lower()
+
+
+def _is_order_form(header_rows):
+    """True if the two rows above the door table hold the order form's headers."""
+    return all(
+        _cell_text(header_rows[r - START_ROW + 2][c - 1]) == text
+        for (r, c), text in FORM_HEADER.items()
+    )
+
 
 def read_order_form(path):
-    wb = openpyxl.load_workbook(path, data_only=True)
-    ws = wb.active
-
-    start_row = 14
-    results = []
-
-    row = start_row
-
-    while True:
-        door_no = ws.cell(row, COL_DOORNO).value
-
-        # End when empty row encountered
-        if door_no in (None, ""):
-            break
-
-        # Determine jamb size from tick
-        jamb = ""
-        if ws.cell(row, COL_92).value == "✓":
-            jamb = "US14 92x18 Undershot"
-        elif ws.cell(row, COL_112).value == "✓":
-            jamb = "US13 112x18 Undershot"
-        elif ws.cell(row, COL_136).value == "✓":
-            jamb = "DG1 136x30 Double Grooved"
-        else:
-            jamb = ""  # None mapped
-
-        # Determine door type
-        if ws.cell(row, COL_SINGLE).value == "✓":
-            form = "Single"
-        elif ws.cell(row, COL_DOUBLE).value == "✓":
-            form = "Double"
-        else:
-            form = ""
-
-        results.append({
-            "Door #": door_no,
-            "Room": ws.cell(row, COL_DESC).value,
-            "Handing": ws.cell(row, COL_HAND).value,
-            "UnderCut": ws.cell(row, COL_UNDERCUT).value,
-            "LeafWidth": ws.cell(row, COL_LEAF_W).value,
-            "LeafHeight": ws.cell(row, COL_LEAF_H).value,
-            "JambType": jamb,
-            "Form": form,
-        })
-
-        row += 1
-
-    return results
+    """
+    Door rows from a returned order form (path or file-like).
+
+    Reads every sheet laid out as an order form, so doors exported onto
+    overflow pages ("UNIT 1 (2)", ...) come back too; other sheets are
+    skipped. Each sheet streams read-only, values only, and stops at its
+    first blank Door # or at the notes block under the table.
+    """
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        results = []
+        forms = 0
+
+        for ws in wb.worksheets:
+            rows = ws.iter_rows(min_row=START_ROW - 2, max_col=COL_SLIDE, values_only=True)
+            header = [tuple(r) + (None,) * (COL_SLIDE - len(r)) for r in islice(rows, 2)]
+            if len(header) < 2 or not _is_order_form(header):
+                continue
+            forms += 1
+
+            for row in rows:
+                row = tuple(row) + (None,) * (COL_SLIDE - len(row))
+                door_no = row[COL_DOORNO - 1]
+
+                # End at an empty row or the notes block
+                if door_no in (None, "") or _cell_text(door_no).startswith(NOTES_LABEL):
+                    break
+
+                results.append({
+                    "Door #": door_no,
+                    "Room": row[COL_DESC - 1],
+                    "Handing": row[COL_HAND - 1],
+                    "UnderCut": row[COL_UNDERCUT - 1],
+                    "LeafWidth": row[COL_LEAF_W - 1],
+                    "LeafHeight": row[COL_LEAF_H - 1],
+                    "JambType": _ticked(row, JAMB_TICKS),
+                    "Form": _ticked(row, FORM_TICKS),
+                })
+
+        if not forms:
+            raise ValueError("no sheet laid out as a door order form")
+        return results
+    finally:
+        wb.close()
+
+
+# ============================================================
+# BATCH IMPORT
+# ============================================================
+
+def _read_one(source):
+    name = source if isinstance(source, str) else getattr(source, "name", "upload")
+    try:
+        return os.path.basename(name), read_order_form(source), None
+    except Exception as e:
+        return os.path.basename(name), [], str(e)
+
+
+def read_order_forms(sources, workers=None):
+    """
+    Import many returned forms at once.
+
+    sources: a folder (every .xlsx in it), or a list of paths / file-like
+    objects. Paths are parsed across a process pool, file-likes (e.g.
+    uploads) across threads; few forms are read in this process.
+
+    Returns (combined DataFrame with a 'Source File' column, errors list)
+    """
+    if isinstance(sources, str) and os.path.isdir(sources):
+        sources = sorted(
+            os.path.join(sources, f) for f in os.listdir(sources)
+            if f.lower().endswith(".xlsx") and not f.startswith("~$")
+        )
+    sources = list(sources)
+
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(sources) < MIN_POOL_FORMS:
+        results = [_read_one(s) for s in sources]
+    else:
+        on_disk = all(isinstance(s, str) for s in sources)
+        pool_cls = ProcessPoolExecutor if on_disk else ThreadPoolExecutor
+        with pool_cls(max_workers=min(workers, len(sources))) as pool:
+            results = list(pool.map(_read_one, sources))
+
+    frames, errors = [], []
+    for name, rows, error in results:
+        if error:
+            errors.append(f"{name}: {error}")
+        elif rows:
+            frames.append(pd.DataFrame(rows, columns=ORDER_FORM_COLUMNS).assign(**{"Source File": name}))
+
+    if not frames:
+        return pd.DataFrame(columns=ORDER_FORM_COLUMNS + ["Source File"]), errors
+    return pd.concat(frames, ignore_index=True), errors
@@ -6,8 +6,11 @@ from reportlab.lib.pagesizes import landscape, A4
 from reportlab.lib import colors
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import mm
+from reportlab.pdfgen import canvas
+from reportlab.pdfbase.pdfmetrics import stringWidth
 from io import BytesIO
 import os
+import numpy as np
 
 CHECKED = "☑"
 UNCHECKED = "☐"
@@ -15,6 +18,9 @@ UNCHECKED = "☐"
 HDL_GREY = colors.HexColor("#57585A")
 LOGO_PATH = "assets/hdl_logo.png"
 
+# Above this many doors the PDF is drawn straight onto the canvas
+LARGE_JOB_DOORS = 300
+
 
 def add_logo_and_title(story, title, h1):
     if os.path.exists(LOGO_PATH):
@@ -35,8 +41,20 @@ def generate_production_pdf(
     cutlists=None,
     job_name="Job Name",
     customer="Customer",
-    qnum="Q-XXXX"
+    qnum="Q-XXXX",
+    large_job=None,
+    progress=None
 ):
+    """
+    Production report PDF. large_job=None picks the canvas builder
+    automatically above LARGE_JOB_DOORS doors. progress, if given, is
+    called with the fraction done (0..1).
+    """
+    if large_job or (large_job is None and len(data) > LARGE_JOB_DOORS):
+        return generate_large_production_pdf(
+            data, jamb_summary, stop_summary, blanks_df, hinge_qty, screw_qty,
+            cutlists, job_name, customer, qnum, progress
+        )
 
     buffer = BytesIO()
 
@@ -264,7 +282,360 @@ def generate_production_pdf(
     # FINISH
     # ============================================================
 
+    if progress:
+        progress(0.5)
     doc.build(story)
+    if progress:
+        progress(1.0)
     pdf = buffer.getvalue()
     buffer.close()
     return pdf
+
+
+# ============================================================
+# LARGE JOBS — CANVAS BUILDER
+# ============================================================
+#
+# No platypus story: every table is cut into fixed-height rows with
+# column widths worked out once, and each assembly plan card is a
+# cached form (static labels + box) with only its values drawn per door.
+# Nothing is laid out twice and nothing is kept per door but the page
+# stream itself.
+
+PAGE_W, PAGE_H = landscape(A4)
+MARGIN = 20
+ROW_H = 13
+CELL_PAD = 4
+FONT = "Helvetica"
+FONT_BOLD = "Helvetica-Bold"
+FONT_SIZE = 8
+
+CARD_COLS, CARD_ROWS = 3, 2
+CARD_LEADING = 11.5  # at most; tightened to fit the card
+CARD_TOP = 30  # card top -> first line baseline
+CARD_GAP = 4  # extra space above each section heading
+
+# (label, value key) per assembly card line; label only = section heading
+CARD_LINES = [
+    ("Leaf Makeup", None),
+    ("Type:", "leaf_type"),
+    ("Leaf Height:", "leaf_height"),
+    ("Leaf Width:", "leaf_width"),
+    ("Thickness:", "leaf_thickness"),
+    ("Leaves:", "leaves"),
+    ("Frame", None),
+    ("Jamb Type:", "jamb_type"),
+    ("Leg Lengths:", "leg2"),
+    ("Head Length:", "head"),
+    ("Stops", None),
+    ("Stop Lengths:", "leg2"),
+    ("Head Stop Length:", "head"),
+    ("Hardware", None),
+    ("Hinges:", "hinges"),
+    ("Screws:", "screws"),
+    ("Measured:", "measured"),
+]
+CARD_VALUE_X = 95
+
+
+def _card_leading(h):
+    """Line spacing that leaves one clear line between the last line and the card's bottom edge."""
+    gaps = CARD_GAP * sum(1 for _, key in CARD_LINES if key is None)
+    return min(CARD_LEADING, (h - CARD_TOP - gaps) / len(CARD_LINES))
+
+
+def _str_column(values):
+    """Column -> list of display strings ('' for missing)."""
+    out = []
+    for v in values:
+        if v is None or (isinstance(v, float) and np.isnan(v)):
+            out.append("")
+        elif isinstance(v, (float, np.floating)) and float(v).is_integer():
+            out.append(str(int(v)))
+        else:
+            out.append(str(v))
+    return out
+
+
+def _int_column(values):
+    """Column -> ints (missing -> 0)."""
+    out = []
+    for v in values:
+        try:
+            out.append(int(v))
+        except (TypeError, ValueError):
+            out.append(0)
+    return out
+
+
+def _column_widths(header, columns, max_width):
+    """Widest header/value per column (each distinct value measured once), fitted to max_width."""
+    widths = []
+    for h, col in zip(header, columns):
+        w = stringWidth(str(h), FONT_BOLD, FONT_SIZE)
+        for v in set(col):
+            w = max(w, stringWidth(v, FONT, FONT_SIZE))
+        widths.append(w + 2 * CELL_PAD)
+
+    total = sum(widths)
+    if total > max_width:
+        widths = [w * max_width / total for w in widths]
+    return widths
+
+
+class _LargeJobCanvas:
+    """Page cursor over a bare canvas."""
+
+    def __init__(self, buffer, job_name):
+        self.c = canvas.Canvas(buffer, pagesize=(PAGE_W, PAGE_H), pageCompression=1)
+        self.job_name = job_name
+        self.y = None
+        self.logo = os.path.exists(LOGO_PATH)
+
+    def page(self, title):
+        if self.y is not None:
+            self.c.showPage()
+        top = PAGE_H - MARGIN
+        if self.logo:
+            # Same image name every page -> embedded once
+            self.c.drawImage(LOGO_PATH, MARGIN, top - 15 * mm, width=45 * mm, height=15 * mm, mask="auto")
+            top -= 15 * mm + 6
+        self.c.setFillColor(HDL_GREY)
+        self.c.setFont(FONT_BOLD, 20)
+        self.c.drawString(MARGIN, top - 20, f"{self.job_name} — {title}")
+        self.y = top - 34
+        self.title = title
+
+    def need(self, height):
+        """Start a continuation page if height doesn't fit."""
+        if self.y - height < MARGIN:
+            self.page(self.title)
+
+    def heading(self, text):
+        self.need(18 + 2 * ROW_H)
+        self.c.setFillColor(HDL_GREY)
+        self.c.setFont(FONT_BOLD, 14)
+        self.c.drawString(MARGIN, self.y - 14, text)
+        self.y -= 20
+
+    def text(self, line):
+        self.need(12)
+        self.c.setFillColor(colors.HexColor("#333333"))
+        self.c.setFont(FONT, 9)
+        self.c.drawString(MARGIN, self.y - 9, line)
+        self.y -= 12
+
+    def table(self, header, columns):
+        """Header + rows (one list of strings per column), paged in fixed-height chunks."""
+        widths = _column_widths(header, columns, PAGE_W - 2 * MARGIN)
+        xs = [MARGIN]
+        for w in widths:
+            xs.append(xs[-1] + w)
+
+        n = len(columns[0]) if columns else 0
+        start = 0
+        while True:
+            self.need(2 * ROW_H)
+            rows = min(n - start, int((self.y - MARGIN) // ROW_H) - 1)
+            self._chunk(header, columns, start, start + rows, xs)
+            start += rows
+            if start >= n:
+                break
+            self.y = MARGIN  # force a new page for the rest
+        self.y -= 10
+
+    def _chunk(self, header, columns, lo, hi, xs):
+        c = self.c
+        top = self.y
+        ys = [top - i * ROW_H for i in range(hi - lo + 2)]
+
+        c.setFillColor(HDL_GREY)
+        c.rect(xs[0], ys[1], xs[-1] - xs[0], ROW_H, stroke=0, fill=1)
+
+        c.setFillColor(colors.white)
+        c.setFont(FONT_BOLD, FONT_SIZE)
+        base = ROW_H - FONT_SIZE - 1
+        for x, h in zip(xs, header):
+            c.drawString(x + CELL_PAD, ys[1] + base, str(h))
+
+        # One text object for the whole chunk instead of one per cell
+        t = c.beginText()
+        t.setFont(FONT, FONT_SIZE)
+        t.setFillColor(colors.black)
+        for x, col in zip(xs, columns):
+            for i, v in enumerate(col[lo:hi]):
+                t.setTextOrigin(x + CELL_PAD, ys[i + 2] + base)
+                t.textOut(v)
+        c.drawText(t)
+
+        c.setStrokeColor(colors.grey)
+        c.setLineWidth(0.3)
+        c.grid(xs, ys)
+        self.y = ys[-1]
+
+    def frame(self, df):
+        header = list(df.columns)
+        self.table(header, [_str_column(df[col].tolist()) for col in header])
+
+    def card_form(self, w, h):
+        """Assembly card template: border + every static label, drawn once."""
+        c = self.c
+        c.beginForm("assembly_card")
+        c.setStrokeColor(colors.grey)
+        c.setLineWidth(0.3)
+        c.rect(0, 0, w, h)
+        leading = _card_leading(h)
+        y = h - CARD_TOP
+        for label, key in CARD_LINES:
+            if key is None:
+                c.setFont(FONT_BOLD, 9)
+                y -= CARD_GAP
+            else:
+                c.setFont(FONT, 9)
+            c.setFillColor(colors.HexColor("#333333"))
+            c.drawString(8, y, label)
+            y -= leading
+        c.endForm()
+
+
+def generate_large_production_pdf(
+    data,
+    jamb_summary,
+    stop_summary,
+    blanks_df=None,
+    hinge_qty=None,
+    screw_qty=None,
+    cutlists=None,
+    job_name="Job Name",
+    customer="Customer",
+    qnum="Q-XXXX",
+    progress=None
+):
+    """Same report as generate_production_pdf, drawn directly on the canvas."""
+    buffer = BytesIO()
+    pdf = _LargeJobCanvas(buffer, job_name)
+    n = len(data)
+
+    def col(name, default=""):
+        return data[name].tolist() if name in data.columns else [default] * n
+
+    measured = [CHECKED if m else UNCHECKED for m in col("Measured", False)]
+
+    # ============================================================
+    # DOOR LIST
+    # ============================================================
+    pdf.page("Door List")
+    pdf.text(f"Customer: {customer}")
+    pdf.text(f"Quote #: {qnum}")
+    pdf.y -= 6
+
+    pdf.table(
+        ["Door #", "Form", "Jamb Type", "Leg (mm)", "Head (mm)", "Measured"],
+        [_str_column(col("Door #")), _str_column(col("Form")), _str_column(col("JambType")),
+         _str_column(col("Leg (mm)")), _str_column(col("Head (mm)")), measured],
+    )
+
+    # ============================================================
+    # SUMMARY OF PARTS
+    # ============================================================
+    pdf.page("Summary of Parts")
+
+    pdf.heading("Door Blanks")
+    if blanks_df is not None and not blanks_df.empty:
+        pdf.frame(blanks_df)
+    else:
+        pdf.text("No door blanks found.")
+
+    pdf.heading("Jambs (Stock Summary)")
+    if jamb_summary is not None and not jamb_summary.empty:
+        pdf.frame(jamb_summary)
+
+    pdf.heading("Stops")
+    if stop_summary is not None and not stop_summary.empty:
+        pdf.frame(stop_summary)
+
+    pdf.heading("Hardware")
+    pdf.table(["Item", "Qty"], [["Hinges", "Screws"], [str(hinge_qty or 0), str(screw_qty or 0)]])
+
+    # ============================================================
+    # CUT LISTS
+    # ============================================================
+    pdf.page("Cut Lists")
+    for label, df in (cutlists or {}).items():
+        pdf.heading(label)
+        if df is not None and not df.empty:
+            pdf.frame(df)
+        else:
+            pdf.text("No cuts found for this profile.")
+
+    if progress:
+        progress(0.2)
+
+    # ============================================================
+    # ASSEMBLY PLANS — CARD_COLS x CARD_ROWS per page
+    # ============================================================
+    card_w = (PAGE_W - 2 * MARGIN) / CARD_COLS
+    card_h = (PAGE_H - 2 * MARGIN - 15 * mm - 40) / CARD_ROWS
+    pdf.card_form(card_w - 6, card_h - 6)
+    leading = _card_leading(card_h - 6)
+
+    hinges = _int_column(col("Hinges", 0))
+    leaves = ["2" if f == "Double" else "1" for f in col("Form")]
+    values = {
+        "leaf_type": _str_column(col("LeafType")),
+        "leaf_height": [f"{v} mm" for v in _str_column(col("LeafHeight"))],
+        "leaf_width": [f"{v} mm" for v in _str_column(col("Width", 0))],
+        "leaf_thickness": [f"{v} mm" for v in _str_column(col("LeafThickness"))],
+        "leaves": leaves,
+        "jamb_type": _str_column(col("JambType")),
+        "leg2": [f"{v} mm ×2" for v in _str_column(col("Leg (mm)"))],
+        "head": [f"{v} mm" for v in _str_column(col("Head (mm)"))],
+        "hinges": [str(h) for h in hinges],
+        "screws": [str(h * 6) for h in hinges],
+        "measured": measured,
+    }
+    door_no = _str_column(col("Door #"))
+
+    per_page = CARD_COLS * CARD_ROWS
+    c = pdf.c
+    for i in range(n):
+        slot = i % per_page
+        if slot == 0:
+            pdf.page("Assembly Plans")
+            grid_top = pdf.y
+            if progress:
+                progress(0.2 + 0.7 * i / n)
+
+        x = MARGIN + (slot % CARD_COLS) * card_w
+        y = grid_top - (slot // CARD_COLS + 1) * card_h
+
+        c.saveState()
+        c.translate(x, y)
+        c.doForm("assembly_card")
+
+        c.setFillColor(HDL_GREY)
+        c.setFont(FONT_BOLD, 11)
+        c.drawString(8, card_h - 22, f"Door {door_no[i]} – Assembly Plan")
+
+        t = c.beginText()
+        t.setFont(FONT, 9)
+        t.setFillColor(colors.black)
+        ly = card_h - 6 - CARD_TOP
+        for label, key in CARD_LINES:
+            if key is None:
+                ly -= CARD_GAP
+            else:
+                t.setTextOrigin(CARD_VALUE_X, ly)
+                t.textOut(values[key][i])
+            ly -= leading
+        c.drawText(t)
+        c.restoreState()
+
+    c.showPage()
+    c.save()
+    if progress:
+        progress(1.0)
+    out = buffer.getvalue()
+    buffer.close()
+    return out
+
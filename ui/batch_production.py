@@ -0,0 +1,120 @@
+import streamlit as st
+import pandas as pd
+
+from core.batch_planner import load_job, plan_batch
+from core.cutlist import group_cut_list
+from core.cutting_stock import DEFAULT_TIME_BUDGET_S
+from core.production_helpers import expand_quote_rows
+from core.save_load import get_existing_q_numbers
+from core.stock import STRATEGY_STOCK_LENGTHS
+
+CURRENT_JOB = "Current quote"
+STRATEGIES = ["Mix (5.4 + 2.1)", "Only 5.4", "Only 2.1"]
+
+
+def render_batch_production_tab(settings):
+    st.header("🧱 Batch Production")
+    st.caption(
+        "Cut several jobs as one run: legs and heads from every selected job "
+        "are pooled per jamb profile, and each piece is traced back to its job and door."
+    )
+
+    qnums = get_existing_q_numbers()
+    has_current = bool(st.session_state.get("rows"))
+
+    options = ([CURRENT_JOB] if has_current else []) + qnums
+    if not options:
+        st.info("No saved quotes to batch yet.")
+        return
+
+    selected = st.multiselect("Jobs in this run", options)
+
+    colJ, colS = st.columns(2)
+    jamb_strategy = colJ.selectbox("Jamb Stock", STRATEGIES, key="batch_jamb_stock")
+    stop_strategy = colS.selectbox("Stop Stock", STRATEGIES, key="batch_stop_stock")
+
+    compare = st.checkbox("Compare against cutting each job separately", value=True)
+
+    if not selected or not st.button("Plan Batch 🪚", type="primary"):
+        return
+
+    # ------------------------------------------------------------
+    # LOAD JOBS
+    # ------------------------------------------------------------
+    jobs = {}
+    for job in selected:
+        try:
+            if job == CURRENT_JOB:
+                og_df = pd.DataFrame(st.session_state.rows)
+                doors = st.session_state.get("all_doors")
+                if doors is None:
+                    doors = expand_quote_rows(og_df)
+                jobs[st.session_state.get("proj") or CURRENT_JOB] = (doors, og_df)
+            else:
+                jobs[job] = load_job(job)
+        except Exception as e:
+            st.error(f"❌ Could not load {job}: {e}")
+            return
+
+    # ------------------------------------------------------------
+    # PLAN
+    # ------------------------------------------------------------
+    jamb_lengths = STRATEGY_STOCK_LENGTHS[jamb_strategy.replace("Mix (5.4 + 2.1)", "Mix")]
+    stop_lengths = STRATEGY_STOCK_LENGTHS[stop_strategy.replace("Mix (5.4 + 2.1)", "Mix")]
+
+    with st.spinner(f"Planning {len(jobs)} job(s)..."):
+        result = plan_batch(
+            jobs, jamb_lengths, stop_lengths,
+            kerf=int(settings.get("saw_kerf_mm", 0)),
+            prices=settings.get("stock_prices") or None,
+            time_budget=float(settings.get("cut_time_budget_s", DEFAULT_TIME_BUDGET_S)),
+            compare=compare,
+        )
+
+    allocation = result["allocation"]
+    if allocation.empty:
+        st.warning("No measurable doors in the selected jobs.")
+        return
+
+    # ------------------------------------------------------------
+    # PURCHASES
+    # ------------------------------------------------------------
+    st.markdown("## 🛒 Stock to Order")
+
+    purchases = result["purchases"]
+    colA, colB = st.columns(2)
+    colA.metric("Stock Lengths (combined)", int(purchases["Combined"].sum()))
+    if compare:
+        colB.metric(
+            "Saved vs per-job",
+            int(purchases["Saved"].sum()),
+        )
+    st.dataframe(purchases, use_container_width=True, hide_index=True)
+
+    st.divider()
+
+    # ------------------------------------------------------------
+    # CUT LISTS
+    # ------------------------------------------------------------
+    st.markdown("## 📐 Combined Cut Lists")
+    st.caption("Stock # matches the Piece Allocation below.")
+    for title, df in result["cutlists"].items():
+        st.write(f"### {title}")
+        st.dataframe(group_cut_list(df), use_container_width=True, hide_index=True)
+        with st.expander(f"Every length ({len(df)})"):
+            st.dataframe(df, use_container_width=True, hide_index=True)
+
+    st.divider()
+
+    # ------------------------------------------------------------
+    # ALLOCATION
+    # ------------------------------------------------------------
+    st.markdown("## 🏷️ Piece Allocation")
+    st.dataframe(allocation, use_container_width=True, hide_index=True)
+
+    st.download_button(
+        "Download Allocation CSV",
+        data=allocation.to_csv(index=False).encode("utf-8"),
+        file_name="HDL_Batch_Allocation.csv",
+        mime="text/csv",
+    )
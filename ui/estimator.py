@@ -1,8 +1,14 @@
 import streamlit as st
 import pandas as pd
 
-from core.pricing import leaf_price, frame_cost_and_pieces, stop_cost
-from core.sku import create_sku
+from core.pricing import get_price_book, book_leaf_price, price_lines, COST_COLUMNS
+from core.sku import create_sku, lookup_description
+from core.schedule_import import (
+    read_schedule,
+    map_schedule_columns,
+    normalise_schedule,
+    build_schedule_rows
+)
 from core.save_load import save_quote, suggest_next_q
 
 # NEW IMPORTS FOR DOOR ORDER FORM
@@ -49,8 +55,7 @@ def render_estimator_tab(HINGE_DF):
     prefix = S["prefix_map"][leaf_type]
     sku = create_sku(prefix, thickness, height, width, jamb, form)
 
-    desc_lookup = HINGE_DF[HINGE_DF["Code"] == sku]
-    desc = desc_lookup.iloc[0]["Description"] if not desc_lookup.empty else "DESCRIPTION NOT FOUND"
+    desc = lookup_description(HINGE_DF, sku)
 
     # ---------------------------------------------------------
     # ADD LINE BUTTON
@@ -62,7 +67,7 @@ def render_estimator_tab(HINGE_DF):
         # ---------------------------------------------------------
         poa_key = f"poa_{leaf_type}_{height}_{width}_{thickness}"
 
-        leaf_cost_val = leaf_price(S["door_leaf_prices"][leaf_type], height, width, thickness)
+        leaf_cost_val = book_leaf_price(get_price_book(S), leaf_type, height, width, thickness)
 
         if leaf_cost_val is None and poa_key not in st.session_state:
             st.warning(f"❗ No price for {leaf_type} {height}x{width} {thickness}. Enter POA.")
@@ -81,50 +86,20 @@ def render_estimator_tab(HINGE_DF):
             del st.session_state[poa_key]
 
         # ---------------------------------------------------------
-        # COST CALC BLOCK
+        # COST CALC BLOCK (same engine as bulk pricing)
         # ---------------------------------------------------------
+        line = pd.DataFrame([{
+            "Leaf Type": leaf_type,
+            "Thickness": thickness,
+            "Height": height,
+            "Width": width,
+            "Jamb Type": jamb,
+            "Form": form,
+            "Qty": qty,
+            "Leaf Price": leaf_cost_val,
+        }])
 
-        # Leaves
-        leaves_per_set = 1 if form == "Single" else 2
-
-        # Frame & stop cost
-        frame_cost_val, frame_m, leg_mm, head_mm = frame_cost_and_pieces(
-            height, width, jamb, form,
-            S["frame_prices"], S["minimum_frame_charge"]
-        )
-
-        stop_cost_val = stop_cost(
-            frame_m,
-            S["stop_price"],
-            0
-        )
-
-        labour = S["labour_single"] if form == "Single" else S["labour_double"]
-
-        # ---------------------------------------------------------
-        # UCE — HERE IS THE CLEAN, FINAL HINGE PATCH
-        # ---------------------------------------------------------
-
-        hinges_per_leaf = 3         # rule: all standard doors = 3 hinges per leaf
-        hinge_count = hinges_per_leaf * leaves_per_set
-        screw_count = hinge_count * 6
-
-        hinge_cost_val = hinge_count * S["hinge_price"]
-        screw_cost_val = screw_count * S["screw_cost"]
-
-        # ---------------------------------------------------------
-        # TOTAL COST CALC
-        # ---------------------------------------------------------
-        unit_cost = (
-            leaf_cost_val * leaves_per_set
-            + frame_cost_val
-            + stop_cost_val
-            + labour
-            + hinge_cost_val
-            + screw_cost_val
-        )
-
-        total_cost = unit_cost * qty
+        costs, _ = price_lines(line, S)
 
         # ---------------------------------------------------------
         # BUILD ROW
@@ -143,28 +118,18 @@ def render_estimator_tab(HINGE_DF):
             "Width": width,
             "Qty": qty,
             "Jamb Type": jamb,
-
-            "Unit Cost": unit_cost,
-            "Total Cost": total_cost,
-
-            "Leaf Cost": leaf_cost_val * leaves_per_set,
-            "Frame Cost": frame_cost_val,
-            "Stop Cost": stop_cost_val,
-            "Labour": labour,
-
-            "Hinges": hinge_count,
-            "Hinge Cost": hinge_cost_val,
-            "Screws": screw_count,
-            "Screw Cost": screw_cost_val,
-
-            "Frame Length (m)": frame_m,
-            "Leg Length (mm)": leg_mm,
-            "Head Length (mm)": head_mm,
         }
+        row.update(costs[COST_COLUMNS].to_dict(orient="records")[0])
 
         st.session_state.rows.append(row)
         st.success("Door line added!")
 
+    # ---------------------------------------------------------
+    # BULK IMPORT (DOOR SCHEDULE)
+    # ---------------------------------------------------------
+    with st.expander("Bulk Import Door Schedule (CSV / XLSX)", expanded=False):
+        render_schedule_import(HINGE_DF, S)
+
     # ---------------------------------------------------------
     # SUMMARY + COSTING TABLE
     # ---------------------------------------------------------
@@ -207,6 +172,7 @@ def render_estimator_tab(HINGE_DF):
                 df.to_dict(orient="records"),
                 S
             )
+            st.session_state.qnum = qnum
             st.success(f"Quote {qnum} saved!")
 
         # CSV EXPORT
@@ -255,4 +221,65 @@ def render_estimator_tab(HINGE_DF):
         st.session_state.rows = []
         st.session_state.cust = ""
         st.session_state.proj = ""
+        st.session_state.qnum = ""
         st.success("Reset complete.")
+
+
+def render_schedule_import(HINGE_DF, S):
+    st.caption(
+        "Columns: Leaf Type, Thickness, Height, Width, Jamb Type, Form, Qty "
+        "(common aliases like 'Leaf', 'Jamb', 'Quantity' are recognised)."
+    )
+
+    uploaded = st.file_uploader("Upload door schedule", type=["csv", "xlsx"], key="schedule_upload")
+    if not uploaded:
+        return
+
+    try:
+        mapped = map_schedule_columns(read_schedule(uploaded))
+    except Exception as e:
+        st.error(f"❌ Could not read schedule: {e}")
+        return
+
+    clean, errors = normalise_schedule(mapped, S)
+
+    if not errors.empty:
+        st.warning(f"{len(errors)} schedule row(s) could not be mapped and will be skipped.")
+        st.dataframe(errors, use_container_width=True)
+
+    if clean.empty:
+        return
+
+    rows, poa = build_schedule_rows(
+        clean, S, HINGE_DF,
+        customer=st.session_state.cust,
+        project=st.session_state.proj,
+    )
+
+    st.success(f"{len(rows)} line(s) priced.")
+    st.dataframe(rows[["SKU", "Description", "Qty", "Unit Cost", "Total Cost"]], use_container_width=True)
+
+    if not poa.empty:
+        st.warning(f"❗ {len(poa)} line(s) need a POA leaf price. Enter a price or leave 0 to skip.")
+        poa_edit = st.data_editor(
+            poa.assign(**{"POA Price": 0.0}),
+            use_container_width=True,
+            hide_index=True,
+            disabled=list(poa.columns),
+            key="schedule_poa",
+        )
+
+        filled = poa_edit[poa_edit["POA Price"] > 0]
+        if not filled.empty:
+            priced = clean.merge(filled[["Schedule Row", "POA Price"]], on="Schedule Row")
+            priced = priced.rename(columns={"POA Price": "Leaf Price"})
+            poa_rows, _ = build_schedule_rows(
+                priced, S, HINGE_DF,
+                customer=st.session_state.cust,
+                project=st.session_state.proj,
+            )
+            rows = pd.concat([rows, poa_rows], ignore_index=True)
+
+    if st.button(f"Add {len(rows)} Line(s) to Quote"):
+        st.session_state.rows.extend(rows.to_dict(orient="records"))
+        st.success(f"{len(rows)} door line(s) added!")
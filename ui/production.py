@@ -1,123 +1,136 @@
+import hashlib
+
 import streamlit as st
 import pandas as pd
 
 from core.production_helpers import (
-    calc_head_length,
-    calc_frame_lengths,
-    apply_stock_strategy
+    expand_quote_rows,
+    merge_measurements,
+    refresh_production_calcs
 )
+from core.cutlist import cut_list_frame, group_cut_list, frame_pieces
+from core.offcuts import get_offcut_store
+from core.saw_sequence import saw_sequence
+from core.background import content_hash, get_background_builds
+from core.plan_cache import solve_cut_plans, cached_strategy_mix, pieces_key
+from core.cutting_stock import DEFAULT_TIME_BUDGET_S
 
 from ui.production_template import generate_production_template
 from pdf.production_pdf import generate_production_pdf
-from pdf.door_order_import import read_order_form
+from pdf.door_order_import import read_order_form, read_order_forms
 
 
 # ===================================================================
 # HELPERS
 # ===================================================================
 
-def expand_quote_rows(og_df):
-    """Build rows for measurement editor."""
-    doors = []
-    door_counter = 1
-
-    for idx, row in og_df.iterrows():
-        sets = int(row["Qty"])
-        for _ in range(sets):
-            doors.append({
-                "Door #": str(door_counter),
-                "QuoteLine": idx,
-                "SKU": row["SKU"],
-                "LeafType": row["Leaf Type"],
-                "Height": row["Height"],
-                "Width": row["Width"],
-                "JambType": row["Jamb Type"],
-                "Form": row["Form"],
-                "Undercut": 20,
-                "FinishedFloorHeight": 0,
-                "Measured": False,
-            })
-            door_counter += 1
-
-    return pd.DataFrame(doors)
-
-
 def import_xlsx_measurements(xlsx):
     """Imports XLSX from measurement template."""
     try:
-        df = pd.read_excel(xlsx)
-        df.columns = [c.strip() for c in df.columns]
+        # The table header sits under the logo/title/job details block
+        raw = pd.read_excel(xlsx, header=None)
+        first = raw.iloc[:, 0].astype(str).str.strip()
+        header = first.eq("Door Number").to_numpy().nonzero()[0]
+        header_row = int(header[0]) if len(header) else 0
+
+        df = raw.iloc[header_row + 1:].copy()
+        df.columns = [str(c).strip() for c in raw.iloc[header_row]]
 
         required = ["Door Number", "Undercut (mm)", "Finished Floor Height (mm)"]
         for r in required:
             if r not in df.columns:
                 raise ValueError(f"Missing column: {r}")
 
+        # Typed-over numbers come back as floats (7.0)
+        door = df["Door Number"].map(
+            lambda v: "" if pd.isna(v) else str(int(v)) if isinstance(v, float) and v.is_integer() else str(v).strip()
+        )
+
         out = pd.DataFrame({
-            "Door #": df["Door Number"].astype(str),
+            "Door #": door,
             "Undercut": df["Undercut (mm)"],
             "FinishedFloorHeight": df["Finished Floor Height (mm)"],
-            "Measured": True
+            "Measured": True,
+            "Row": df.index.to_numpy() + 1,
         })
 
-        return out.dropna(subset=["Door #"])
+        # Only rows site actually measured; one without a Door # is kept
+        # so the merge can report it
+        measured = df[["Undercut (mm)", "Finished Floor Height (mm)"]].notna().any(axis=1)
+        return out[measured.to_numpy()]
 
     except Exception as e:
         raise ValueError(f"Import failed: {e}")
 
 
-def _extract_jamb_thickness(text):
-    """Extract the '18' or '30' from 92x18 etc."""
-    try:
-        for t in str(text).split():
-            if "x" in t:
-                return float(t.split("x")[-1])
-    except:
-        return 18
-    return 18
-
-
-# CLEAN FIXED CUT LIST BUILDER
-def build_cut_list(piece_lengths, stock_lengths):
-    pieces = sorted([int(x) for x in piece_lengths], reverse=True)
-    stocks = sorted(stock_lengths)
-
-    bundles = []
-
-    for p in pieces:
-        placed = False
-
-        for b in bundles:
-            if p <= (b["stock"] - b["used"]):
-                b["cuts"].append(p)
-                b["used"] += p
-                placed = True
-                break
-
-        if not placed:
-            chosen = next((s for s in stocks if p <= s), max(stocks))
-            bundles.append({
-                "stock": chosen,
-                "cuts": [p],
-                "used": p
-            })
-
-    rows = []
-    for b in bundles:
-        rows.append({
-            "Stock Length (mm)": b["stock"],
-            "Cuts (mm)": " + ".join(str(c) for c in b["cuts"]),
-            "Used (mm)": b["used"],
-            "Waste (mm)": b["stock"] - b["used"]
-        })
-
-    return pd.DataFrame(rows)   # FIXED
-
-
 # ===================================================================
 # MAIN PRODUCTION TAB
 # ===================================================================
 
+def render_lazy_download(kind, build, kwargs, label, file_name, mime):
+    """
+    Build-on-request download: nothing is generated until asked, the build
+    runs on a worker thread, and the bytes are kept under a hash of the
+    inputs, so reruns with unchanged inputs download straight away.
+    """
+    builds = get_background_builds(kind)
+    key = content_hash(*[kwargs[k] for k in sorted(kwargs)])
+    state, value = builds.status(key)
+
+    if state == "idle":
+        if not st.button(f"Build {label}", key=f"build_{kind}"):
+            st.caption(f"{label} is built on request.")
+            return
+        builds.submit(key, build, **kwargs)
+        state, value = builds.status(key)
+
+    if state == "running":
+        bar = st.progress(0.0, text=f"Building {label}...")
+        while state == "running":
+            bar.progress(min(value, 1.0), text=f"Building {label}...")
+            state, value = builds.wait(key, timeout=0.2)
+        bar.empty()
+
+    if state == "failed":
+        st.error(f"❌ Could not build {label}: {value}")
+        return
+
+    st.download_button(
+        f"Download {label}",
+        data=value,
+        file_name=file_name,
+        mime=mime,
+        key=f"download_{kind}",
+    )
+
+
+def render_offcut_rack(store, plans, job):
+    """Offcuts this job will use, and the button that sends it to the saw."""
+    from_rack = sum(int((p["offcut"] >= 0).sum()) for p in plans.values())
+    st.info(f"♻️ {from_rack} length(s) in these cut lists come from the offcut rack.")
+
+    if not job:
+        st.warning("Save or load this quote to commit it to the offcut rack.")
+    elif store.is_committed(job):
+        st.caption(f"{job} is already committed to the offcut rack; the cut lists above are the ones it was committed with.")
+    elif st.button(f"Commit {job} to Offcut Rack", help="Marks the offcuts above as used and racks this job's new offcuts"):
+        try:
+            used, added = store.commit_job(job, plans)
+            st.success(f"Used {used} offcut(s), racked {added} new offcut(s).")
+        except ValueError as e:
+            st.error(f"❌ {e}")
+
+    with st.expander("Offcut Rack"):
+        rack = pd.DataFrame(
+            store.available(),
+            columns=["ID", "Profile", "Length (mm)", "Source", "Added"]
+        )
+        if rack.empty:
+            st.caption("No offcuts on the rack.")
+        else:
+            st.dataframe(rack, use_container_width=True, hide_index=True)
+
+
 def render_production_tab(og_df, settings):
 
     st.header("🏭 Production")
@@ -126,24 +139,26 @@ def render_production_tab(og_df, settings):
         st.warning("No doors in this quote yet.")
         return
 
+    # Saved or loaded quote number; offcuts are committed against it
+    qnum = st.session_state.get("qnum", "")
+
     # ============================================================
     # EXPORT TEMPLATE
     # ============================================================
 
     st.markdown("## 📤 Download XLSX Measurement Template")
-    template = generate_production_template(
-        df_quote=og_df,
-        client=st.session_state.cust,
-        project=st.session_state.proj,
-        quote_number=settings.get("last_quote", "Q-XXXX"),
-    )
-
-    st.download_button(
-        "Download XLSX Template",
-        data=template,
+    render_lazy_download(
+        "xlsx",
+        generate_production_template,
+        dict(
+            df_quote=og_df,
+            client=st.session_state.cust,
+            project=st.session_state.proj,
+            quote_number=qnum or "Q-XXXX",
+        ),
+        label="XLSX Template",
         file_name="HDL_Measurement_Template.xlsx",
         mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        type="primary"
     )
 
     st.divider()
@@ -154,12 +169,17 @@ def render_production_tab(og_df, settings):
 
     st.subheader("📥 Upload HD Door Order Form (.xlsx)")
 
-    uploaded_form = st.file_uploader("Upload Door Order Form (.xlsx)")
+    uploaded_forms = st.file_uploader("Upload Door Order Form(s) (.xlsx)", accept_multiple_files=True)
 
-    if uploaded_form:
+    if uploaded_forms:
         try:
-            imported_rows = read_order_form(uploaded_form)
-            imported_df = pd.DataFrame(imported_rows)
+            if len(uploaded_forms) == 1:
+                imported_df = pd.DataFrame(read_order_form(uploaded_forms[0]))
+            else:
+                # Several returned forms: read side by side, one combined table
+                imported_df, form_errors = read_order_forms(uploaded_forms)
+                for err in form_errors:
+                    st.warning(f"⚠️ Skipped {err}")
 
             st.success("Door Order Form imported successfully.")
             st.dataframe(imported_df, use_container_width=True)
@@ -181,6 +201,41 @@ def render_production_tab(og_df, settings):
     # EDIT DOORS INLINE
     # ============================================================
 
+    st.subheader("📥 Upload Site Measurements (.xlsx)")
+
+    uploaded_measurements = st.file_uploader(
+        "Upload completed XLSX Measurement Template", type=["xlsx"], key="measurement_upload"
+    )
+
+    if uploaded_measurements:
+        # The uploader keeps its file across reruns: merge each file once
+        digest = hashlib.sha1(uploaded_measurements.getvalue()).hexdigest()
+        if st.session_state.get("merged_measurements") != digest:
+            try:
+                measured = import_xlsx_measurements(uploaded_measurements)
+                st.session_state.all_doors, report = merge_measurements(
+                    st.session_state.all_doors, measured
+                )
+                st.session_state.merged_measurements = digest
+                st.session_state.measurement_report = report
+            except ValueError as e:
+                st.error(f"❌ {e}")
+
+        report = st.session_state.get("measurement_report")
+        if report:
+            c1, c2, c3 = st.columns(3)
+            c1.metric("Doors Matched", report["matched"])
+            c2.metric("Measurements Changed", report["updated"])
+            c3.metric("Unmatched", len(report["unmatched"]))
+            if report["unmatched"]:
+                st.warning("⚠️ Not in this job: " + ", ".join(report["unmatched"]))
+            if report.get("blank"):
+                st.warning("⚠️ No Door Number, not merged (sheet rows): " + ", ".join(map(str, report["blank"])))
+            if report["duplicates"]:
+                st.warning("⚠️ Listed more than once (last row used): " + ", ".join(report["duplicates"]))
+            if report["duplicate_doors"]:
+                st.warning("⚠️ Door # repeated in the door table (first used): " + ", ".join(report["duplicate_doors"]))
+
     st.subheader("🔧 Edit Door Measurements (Per Set)")
 
     st.session_state.all_doors["Door #"] = st.session_state.all_doors["Door #"].astype(str)
@@ -207,48 +262,18 @@ def render_production_tab(og_df, settings):
 
     st.markdown("## 🧮 Production Calculations")
 
-    calc_rows = []
+    # Only doors that changed since the last run are recomputed
+    quote_key = content_hash(og_df)
+    prev = st.session_state.get("production_calcs")
+    if prev is None or prev[0] != quote_key:
+        prev = (quote_key, None, None)
 
-    for _, r in edited.iterrows():
+    calc_df, recomputed = refresh_production_calcs(prev[1], prev[2], edited, og_df)
+    st.session_state.production_calcs = (quote_key, edited.copy(), calc_df)
+    calc_df = calc_df.copy()
 
-        final_h = int(r["Height"]) + 3 + int(r["Undercut"]) + int(r["FinishedFloorHeight"])
-
-        head_mm = calc_head_length(
-            width=r["Width"],
-            jamb_thickness=_extract_jamb_thickness(r["JambType"]),
-            form=r["Form"]
-        )
-
-        leg_mm = final_h
-
-        per_frame_m, total_frame_m, total_stop_m = calc_frame_lengths(
-            leg_mm=leg_mm,
-            head_mm=head_mm,
-            qty=1
-        )
-
-        hinge_qty = int(og_df.loc[r["QuoteLine"]]["Hinges"]) if "QuoteLine" in r else 0
-
-        calc_rows.append({
-            "Door #": r["Door #"],
-            "QuoteLine": r.get("QuoteLine", 0),
-            "LeafType": r["LeafType"],
-            "LeafHeight": r["Height"],
-            "LeafThickness": og_df.loc[r.get("QuoteLine", 0)]["Thickness"],
-            "FinalHeight": final_h,
-            "Width": r["Width"],
-            "JambType": r["JambType"],
-            "Form": r["Form"],
-            "Leg (mm)": leg_mm,
-            "Head (mm)": head_mm,
-            "Total Frame (m)": total_frame_m,
-            "Total Stop (m)": total_stop_m,
-            "Hinges": hinge_qty,
-            "Measured": r["Measured"],
-        })
-
-    calc_df = pd.DataFrame(calc_rows)
     st.dataframe(calc_df, use_container_width=True)
+    st.caption(f"{recomputed} of {len(edited)} door(s) recalculated.")
 
     st.divider()
 
@@ -288,7 +313,7 @@ def render_production_tab(og_df, settings):
     # Jambs
     # ============================================================
 
-    calc_df["JambProfile"] = calc_df["JambType"].apply(lambda j: str(j).split()[0])
+    calc_df["JambProfile"] = calc_df["JambType"].astype(str).str.split().str[0]
     jambs = (
         calc_df.groupby("JambProfile")["Total Frame (m)"]
         .sum()
@@ -326,19 +351,16 @@ def render_production_tab(og_df, settings):
     jamb_mode = jamb_strategy.replace("Mix (5.4 + 2.1)", "Mix")
     stop_mode = stop_strategy.replace("Mix (5.4 + 2.1)", "Mix")
 
-    summary = []
-    for _, r in jambs.iterrows():
-        total_m = r["Meters"]
-        qty54, qty21, waste = apply_stock_strategy(total_m, jamb_mode)
-        summary.append({
-            "Profile": r["JambProfile"],
-            "Meters": total_m,
-            "5.4m Qty": qty54,
-            "2.1m Qty": qty21,
-            "Waste (m)": waste
-        })
+    # All profiles in one vectorized pass
+    qty54, qty21, waste = cached_strategy_mix(jambs["Meters"].to_numpy(), jamb_mode)
 
-    summary_df = pd.DataFrame(summary)
+    summary_df = pd.DataFrame({
+        "Profile": jambs["JambProfile"],
+        "Meters": jambs["Meters"],
+        "5.4m Qty": qty54,
+        "2.1m Qty": qty21,
+        "Waste (m)": waste,
+    })
     st.dataframe(summary_df, use_container_width=True)
 
     st.divider()
@@ -349,28 +371,23 @@ def render_production_tab(og_df, settings):
 
     cutlists = {}
 
-    for prof, grp in calc_df.groupby("JambProfile"):
-        pieces = []
-        for _, row in grp.iterrows():
-            leg = int(row["Leg (mm)"])
-            head = int(row["Head (mm)"])
-            pieces.extend([leg] * 2)
-            pieces.append(head)
-
-        stock_lengths = (
-            [5400] if jamb_mode == "Only 5.4"
-            else [2100] if jamb_mode == "Only 2.1"
-            else [2100, 5400]
-        )
+    kerf = int(settings.get("saw_kerf_mm", 0))
+    stock_prices = settings.get("stock_prices") or None
+    groups = list(calc_df.groupby("JambProfile"))
 
-        cutlists[f"Jamb — {prof}"] = build_cut_list(pieces, stock_lengths)
+    # Each profile gets the same budget, so adding or dropping a profile
+    # leaves the others' memo keys (and plans) alone
+    budget = float(settings.get("cut_time_budget_s", DEFAULT_TIME_BUDGET_S))
 
-    stop_pieces = []
-    for _, row in calc_df.iterrows():
-        leg = int(row["Leg (mm)"])
-        head = int(row["Head (mm)"])
-        stop_pieces.extend([leg] * 2)
-        stop_pieces.append(head)
+    stock_lengths = (
+        [5400] if jamb_mode == "Only 5.4"
+        else [2100] if jamb_mode == "Only 2.1"
+        else [2100, 5400]
+    )
+
+    use_offcuts = bool(settings.get("use_offcuts", True))
+    store = get_offcut_store() if use_offcuts else None
+    plans = {}
 
     stop_stock_lengths = (
         [5400] if stop_mode == "Only 5.4"
@@ -378,13 +395,85 @@ def render_production_tab(og_df, settings):
         else [2100, 5400]
     )
 
-    cutlists["Stops"] = build_cut_list(stop_pieces, stop_stock_lengths)
+    # Every profile + stops is its own problem: memoised, and the misses
+    # are solved side by side in worker processes
+    jobs = [(f"Jamb — {prof}", prof, frame_pieces(grp), stock_lengths) for prof, grp in groups]
+    jobs.append(("Stops", "Stops", frame_pieces(calc_df), stop_stock_lengths))
+
+    # A committed job is cut from the plans it was committed with, not
+    # re-planned against a rack now holding its own offcuts
+    committed = (store.committed_plans(qnum) if store is not None and qnum else None) or {}
+
+    fresh = iter(solve_cut_plans([
+        dict(
+            piece_lengths=pieces, stock_lengths=lengths,
+            kerf=kerf, prices=stock_prices, time_budget=budget,
+            rack=store.rack(profile) if store else None,
+            rack_version=store.version(profile) if store else None,
+        )
+        for _, profile, pieces, lengths in jobs
+        if profile not in committed
+    ]))
+    solved = [committed[profile] if profile in committed else next(fresh) for _, profile, _, _ in jobs]
+
+    changed = [
+        title for title, profile, pieces, _ in jobs
+        if profile in committed and pieces_key(committed[profile]["piece"]) != pieces_key(pieces)
+    ]
+    if changed:
+        st.warning(
+            f"Doors have changed since {qnum} was committed to the offcut rack "
+            f"({', '.join(changed)}). These cut lists are the committed ones."
+        )
+
+    # Saw + PDF get one row per distinct pattern; every length stays on hand
+    expanded = {}
+    for (title, profile, _, _), plan in zip(jobs, solved):
+        expanded[title] = cut_list_frame(plan)
+        cutlists[title] = group_cut_list(expanded[title])
+        if store is not None:
+            plans[profile] = plan
 
     st.subheader("Cut Lists Ready for PDF")
 
     for title, df in cutlists.items():
         st.write(f"### {title}")
-        st.dataframe(df, use_container_width=True)
+        st.dataframe(df, use_container_width=True, hide_index=True)
+        with st.expander(f"Every length ({len(expanded[title])})"):
+            st.dataframe(expanded[title], use_container_width=True, hide_index=True)
+
+    # ============================================================
+    # SAW SEQUENCE
+    # ============================================================
+
+    st.markdown("## 🪚 Saw Sequence")
+    st.caption("Every cut of one length is made in one go, longest first, so the length stop moves once per length.")
+
+    sequences = []
+    for (title, _, _, _), plan in zip(jobs, solved):
+        seq, report = saw_sequence(plan)
+        sequences.append(seq.assign(**{"Cut List": title}))
+
+        with st.expander(f"{title} — {report['after']} stop setting(s), was {report['before']}"):
+            c1, c2, c3 = st.columns(3)
+            c1.metric("Cuts", report["cuts"])
+            c2.metric("Stop Changes (cut list order)", report["before"])
+            c3.metric("Stop Changes (sequenced)", report["after"], delta=report["after"] - report["before"], delta_color="inverse")
+            st.dataframe(seq, use_container_width=True, hide_index=True)
+
+    st.download_button(
+        "Download Saw Sequence CSV",
+        data=pd.concat(sequences, ignore_index=True).to_csv(index=False).encode("utf-8"),
+        file_name="HDL_Saw_Sequence.csv",
+        mime="text/csv",
+    )
+
+    # ============================================================
+    # OFFCUT RACK
+    # ============================================================
+
+    if store is not None:
+        render_offcut_rack(store, plans, qnum)
 
     st.divider()
 
@@ -397,7 +486,7 @@ def render_production_tab(og_df, settings):
     total_hinges = int(calc_df["Hinges"].sum())
     total_screws = total_hinges * 6
 
-    pdf = generate_production_pdf(
+    pdf_args = dict(
         data=calc_df,
         jamb_summary=summary_df,
         stop_summary=stop_df,
@@ -407,12 +496,14 @@ def render_production_tab(og_df, settings):
         cutlists=cutlists,
         job_name=st.session_state.proj,
         customer=st.session_state.cust,
-        qnum=settings.get("last_quote", "Q-XXXX")
+        qnum=qnum or "Q-XXXX"
     )
 
-    st.download_button(
-        "Download Production PDF",
-        data=pdf,
+    render_lazy_download(
+        "pdf",
+        generate_production_pdf,
+        pdf_args,
+        label="Production PDF",
         file_name="HDL_Production_Report.pdf",
-        mime="application/pdf"
+        mime="application/pdf",
     )
@@ -1,23 +1,95 @@
+import numpy as np
 import pandas as pd
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Alignment, Font, PatternFill
 from openpyxl.drawing.image import Image
+from openpyxl.utils import get_column_letter
 from io import BytesIO
 from datetime import datetime
 
+from core.production_helpers import door_numbers
+
 
 HDL_ORANGE = "FF6600"
 
+TITLE = "HDL PRODUCTION MEASUREMENT TEMPLATE"
+
+TABLE_HEADERS = [
+    "Door Number",
+    "SKU",
+    "Description",
+    "Height",
+    "Width",
+    "Form",
+    "Qty",
+    "Undercut (mm)",
+    "Finished Floor Height (mm)"
+]
+
+# Quote columns copied onto every door row, in table order (cols 2-6)
+QUOTE_FIELDS = ["SKU", "Description", "Height", "Width", "Form"]
+
+
+def _text_len(values):
+    """Longest printed length in a column (one vectorized pass)."""
+    s = pd.Series(values, dtype=object).map(lambda v: "" if v is None else str(v))
+    return int(s.str.len().max()) if len(s) else 0
 
-def generate_production_template(df_quote, client, project, quote_number):
+
+def generate_production_template(df_quote, client, project, quote_number, progress=None):
     """
     Builds an XLSX template duplicated per Qty for site measurements,
-    with HDL logo + corporate orange styling.
+    with HDL logo + corporate orange styling. Door Number is pre-filled
+    with the door table's Door # so the returned sheet merges back.
+
+    Write-only workbook: rows stream straight to disk, so memory stays
+    flat however many doors the job has. Column widths come from each
+    column's longest value, worked out up front (write-only sheets can't
+    be revisited).
     """
 
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Production Template"
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Production Template")
+
+    orange = PatternFill(start_color=HDL_ORANGE, end_color=HDL_ORANGE, fill_type="solid")
+    centre = Alignment(horizontal="center", vertical="center")
+    bold = Font(bold=True)
+
+    def cell(value, font=None, fill=None, alignment=None):
+        c = WriteOnlyCell(ws, value=value)
+        if font:
+            c.font = font
+        if fill:
+            c.fill = fill
+        if alignment:
+            c.alignment = alignment
+        return c
+
+    headers = [
+        ("Client Name:", client),
+        ("Project:", project),
+        ("Quote Number:", quote_number),
+        ("Generated On:", datetime.now().strftime("%d-%m-%Y"))
+    ]
+
+    qty = pd.to_numeric(df_quote["Qty"], errors="coerce").fillna(0).astype(np.int64).clip(lower=0).to_numpy()
+    lines = df_quote.reindex(columns=QUOTE_FIELDS).astype(object)
+    lines = lines.where(lines.notna(), None)
+
+    # ----------------------------------------------------
+    # COLUMN WIDTHS (longest value + 3)
+    # ----------------------------------------------------
+    widths = [len(h) for h in TABLE_HEADERS]
+    widths[0] = max(widths[0], len(TITLE), max(len(l) for l, _ in headers))
+    widths[1] = max(widths[1], max(len(str(v or "")) for _, v in headers))
+    widths[0] = max(widths[0], len(str(int(qty.sum()))))
+    widths[6] = max(widths[6], 1)
+    for i, field in enumerate(QUOTE_FIELDS, start=1):
+        widths[i] = max(widths[i], _text_len(lines[field][qty > 0]))
+
+    for col, w in enumerate(widths, start=1):
+        ws.column_dimensions[get_column_letter(col)].width = w + 3
 
     # ----------------------------------------------------
     # INSERT HDL LOGO
@@ -26,86 +98,48 @@ def generate_production_template(df_quote, client, project, quote_number):
         logo = Image("mnt/data/Logos-01.png")  # adjust if path differs
         logo.width = 200
         logo.height = 60
-        ws.add_image(logo, "A1")
+        logo.anchor = "A1"
+        ws.add_image(logo)
     except Exception as e:
         print("Logo load failed:", e)
 
     # ----------------------------------------------------
     # TITLE BAR
     # ----------------------------------------------------
-    ws.merge_cells("A3:F3")
-    title_cell = ws["A3"]
-    title_cell.value = "HDL PRODUCTION MEASUREMENT TEMPLATE"
-    title_cell.font = Font(bold=True, size=14, color="FFFFFF")
-    title_cell.fill = PatternFill(start_color=HDL_ORANGE, end_color=HDL_ORANGE, fill_type="solid")
-    title_cell.alignment = Alignment(horizontal="center", vertical="center")
+    ws.append([])
+    ws.append([])
+    ws.append([cell(TITLE, Font(bold=True, size=14, color="FFFFFF"), orange, centre)])
+    ws.merged_cells.add("A3:F3")
+    ws.append([])
 
     # ----------------------------------------------------
     # HEADER DETAILS
     # ----------------------------------------------------
-    bold = Font(bold=True)
-
-    headers = [
-        ("Client Name:", client),
-        ("Project:", project),
-        ("Quote Number:", quote_number),
-        ("Generated On:", datetime.now().strftime("%d-%m-%Y"))
-    ]
-
-    row = 5
     for label, value in headers:
-        ws[f"A{row}"].value = label
-        ws[f"A{row}"].font = bold
-        ws[f"B{row}"].value = value
-        row += 1
+        ws.append([cell(label, bold), value])
+
+    ws.append([])
+    ws.append([])
 
     # ----------------------------------------------------
     # TABLE HEADERS
     # ----------------------------------------------------
-    table_headers = [
-        "Door Number",
-        "SKU",
-        "Description",
-        "Height",
-        "Width",
-        "Form",
-        "Qty",
-        "Undercut (mm)",
-        "Finished Floor Height (mm)"
-    ]
-
-    start_row = row + 2
-
-    for col, header in enumerate(table_headers, start=1):
-        cell = ws.cell(row=start_row, column=col, value=header)
-        cell.font = Font(bold=True, color="FFFFFF")
-        cell.fill = PatternFill(start_color=HDL_ORANGE, end_color=HDL_ORANGE, fill_type="solid")
-        cell.alignment = Alignment(horizontal="center", vertical="center")
+    ws.append([cell(h, Font(bold=True, color="FFFFFF"), orange, centre) for h in TABLE_HEADERS])
 
     # ----------------------------------------------------
     # DUPLICATE ROWS PER QTY
     # ----------------------------------------------------
-    write_row = start_row + 1
-
-    for _, r in df_quote.iterrows():
-        for i in range(r["Qty"]):
-            ws.cell(write_row, 1, "")  # Door Number
-            ws.cell(write_row, 2, r["SKU"])
-            ws.cell(write_row, 3, r["Description"])
-            ws.cell(write_row, 4, r["Height"])
-            ws.cell(write_row, 5, r["Width"])
-            ws.cell(write_row, 6, r["Form"])
-            ws.cell(write_row, 7, 1)  # Always 1 per row
-            ws.cell(write_row, 8, "")
-            ws.cell(write_row, 9, "")
-            write_row += 1
-
-    # ----------------------------------------------------
-    # AUTO-COLUMN WIDTH
-    # ----------------------------------------------------
-    for col in ws.columns:
-        max_len = max(len(str(cell.value or "")) for cell in col)
-        ws.column_dimensions[col[0].column_letter].width = max_len + 3
+    total = int(qty.sum())
+    numbers = door_numbers(total).tolist()
+    written = 0
+
+    for n, values in zip(qty.tolist(), lines.itertuples(index=False, name=None)):
+        # Undercut and FFH are left for site
+        for door in numbers[written:written + n]:
+            ws.append([door, *values, 1, None, None])
+        written += n
+        if progress and total:
+            progress(written / total)
 
     # ----------------------------------------------------
     # EXPORT AS BYTES
@@ -4,6 +4,7 @@ from core.save_load import (
     delete_quote,
     get_existing_q_numbers
 )
+from core.reprice import reprice_all_quotes
 
 
 def render_quote_lookup_tab():
@@ -43,3 +44,24 @@ def render_quote_lookup_tab():
             st.rerun()
         else:
             st.error("Could not delete quote.")
+
+    # -------------------------------
+    # BULK RE-PRICE
+    # -------------------------------
+    st.divider()
+    st.subheader("Re-price All Quotes")
+    st.caption("Re-prices every saved quote against the current Settings and stores the result as recalculated rows.")
+
+    force = st.checkbox("Re-price quotes even if settings are unchanged", value=False)
+
+    if st.button("Re-price All Quotes 🔁"):
+        with st.spinner(f"Re-pricing {len(qnums)} quote(s)..."):
+            report = reprice_all_quotes(st.session_state.settings, qnums=qnums, force=force)
+
+        done = report[report["Status"] == "repriced"]
+        c1, c2, c3 = st.columns(3)
+        c1.metric("Re-priced", len(done))
+        c2.metric("Cost Δ", f"${done['Cost Δ'].sum():,.2f}" if not done.empty else "$0.00")
+        c3.metric("Sell Δ", f"${done['Sell Δ'].sum():,.2f}" if not done.empty else "$0.00")
+
+        st.dataframe(report, use_container_width=True)
@@ -35,7 +35,9 @@ def render_settings_tab():
             key=f"leaf_edit_{leaf_type}"
         )
 
-        S["door_leaf_prices"][leaf_type] = edited
+        if not edited.equals(df):
+            S["door_leaf_prices"][leaf_type] = edited
+            S["door_leaf_prices_version"] = S.get("door_leaf_prices_version", 0) + 1
 
     st.markdown('</div>', unsafe_allow_html=True)
 
@@ -130,3 +132,39 @@ def render_settings_tab():
     )
 
     st.markdown('</div>', unsafe_allow_html=True)
+
+    # ------------------------------------------------------------
+    # CUTTING (PRODUCTION)
+    # ------------------------------------------------------------
+    st.markdown('<div class="hdl-card">', unsafe_allow_html=True)
+    st.markdown('<div class="hdl-section-title">Cutting Optimiser</div>', unsafe_allow_html=True)
+
+    S["saw_kerf_mm"] = st.number_input(
+        "Saw Kerf (mm)",
+        value=int(S.get("saw_kerf_mm", 0)),
+        step=1,
+        min_value=0,
+        key="saw_kerf_mm"
+    )
+
+    S["cut_time_budget_s"] = st.number_input(
+        "Cut List Optimiser Time Budget per Profile (s)",
+        value=float(S.get("cut_time_budget_s", 0.25)),
+        step=0.25,
+        min_value=0.0,
+        key="cut_time_budget_s"
+    )
+
+    prices = S.get("stock_prices", {})
+    c1, c2 = st.columns(2)
+    p54 = c1.number_input("5.4m Length Price (0 = minimise waste)", value=float(prices.get(5400, 0.0)), step=0.10, key="stock_price_5400")
+    p21 = c2.number_input("2.1m Length Price (0 = minimise waste)", value=float(prices.get(2100, 0.0)), step=0.10, key="stock_price_2100")
+    S["stock_prices"] = {5400: p54, 2100: p21} if p54 > 0 and p21 > 0 else {}
+
+    S["use_offcuts"] = st.checkbox(
+        "Cut from offcut rack before new stock",
+        value=bool(S.get("use_offcuts", True)),
+        key="use_offcuts"
+    )
+
+    st.markdown('</div>', unsafe_allow_html=True)
@@ -2,12 +2,86 @@ import pandas as pd
 import glob
 import os
 
+# ---------------------------------------------
+# Process-wide hinge sheet cache
+#   key = (path, mtime_ns, size) -> parsed DataFrame
+# ---------------------------------------------
+_HINGE_CACHE = {}
+
+SIDECAR_DIR = ".cache"
+
+
+def _file_key(file):
+    st = os.stat(file)
+    return (os.path.abspath(file), st.st_mtime_ns, st.st_size)
+
+
+def _sidecar_path(key):
+    path, mtime_ns, size = key
+    folder = os.path.join(os.path.dirname(path), SIDECAR_DIR)
+    name = os.path.basename(path)
+    return os.path.join(folder, f"{name}.{mtime_ns}-{size}.pkl")
+
+
+def _parse_hinge_sheet(file):
+    df = pd.read_excel(file)
+    df["Height"] = df["Leaf size"].str.split("x").str[0].astype(int)
+    df["Width"] = df["Leaf size"].str.split("x").str[1].astype(int)
+    return df
+
+
+def _read_sidecar(sidecar):
+    if not os.path.exists(sidecar):
+        return None
+    try:
+        return pd.read_pickle(sidecar)
+    except Exception:
+        return None
+
+
+def _write_sidecar(sidecar, df):
+    """Write the parsed frame and drop sidecars of older sheet versions."""
+    folder = os.path.dirname(sidecar)
+    prefix = os.path.basename(sidecar).rsplit(".", 2)[0] + "."
+    try:
+        os.makedirs(folder, exist_ok=True)
+        tmp = sidecar + ".tmp"
+        df.to_pickle(tmp)
+        os.replace(tmp, sidecar)
+
+        for f in os.listdir(folder):
+            full = os.path.join(folder, f)
+            if f.startswith(prefix) and full != sidecar:
+                os.remove(full)
+    except OSError:
+        # Read-only deploys just fall back to parsing the xlsx
+        pass
+
+
 def load_hinge_sheet(folder):
+    """
+    Load the newest '*Door Data*.xlsx' in folder.
+
+    Parsed frames are cached for the life of the process, keyed on
+    path + mtime + size, and pickled to folder/.cache so a cold start
+    skips the openpyxl parse. The returned frame is shared: do not mutate it.
+    """
     files = glob.glob(os.path.join(folder, "*Door Data*.xlsx"))
     if not files:
         return None
     file = max(files, key=os.path.getmtime)
-    df = pd.read_excel(file)
-    df["Height"] = df["Leaf size"].str.split("x").str[0].astype(int)
-    df["Width"] = df["Leaf size"].str.split("x").str[1].astype(int)
+
+    key = _file_key(file)
+    df = _HINGE_CACHE.get(key)
+    if df is not None:
+        return df
+
+    sidecar = _sidecar_path(key)
+    df = _read_sidecar(sidecar)
+    if df is None:
+        df = _parse_hinge_sheet(file)
+        _write_sidecar(sidecar, df)
+
+    _HINGE_CACHE.clear()
+    _HINGE_CACHE[key] = df
     return df